@@ -31,11 +31,13 @@ python ./.replay.py --trace ./runs/traces/random/112_actions.npy --frame-skip 4
 --out-dir PATH                   # base folder containing runs/ (default: experiments/runs)
 --frame-skip INT                 # sim frames per decision; default 4 (use 1 for normal-speed viewing)
 --slow                           # limit display to ~15 fps for readability
+--speed INT                      # advance N decision steps per drawn frame (fast-forward; default 1)
 
 # Controls during replay
 SPACE = pause/resume
 N     = single step (when paused)
 R     = restart episode
++/-   = double / halve playback speed (1x..16x)
 ESC   = quit
 
 # Notes / gotchas
@@ -45,7 +47,7 @@ ESC   = quit
 """
 
 from __future__ import annotations
-import argparse, os
+import argparse, functools, os
 from pathlib import Path
 from typing import Optional, List, Tuple
 
@@ -80,26 +82,46 @@ def _read_meta(out_dir: Path, policy: str, seed: int) -> dict:
                 meta[k.strip()] = v.strip()
     return meta
 
-def _draw_overlay(env: GGEnv, step_idx: int, action: Optional[int]):
-    # Draw extra overlay on top of env's render using current pygame surface
+@functools.lru_cache(maxsize=1)
+def _get_font() -> pygame.font.Font:
+    return pygame.font.SysFont("jetbrainsmono", 16)
+
+# Rendered text surfaces keyed by string; overlay lines round floats to a
+# couple of decimals, so the hit rate across frames is high.
+_text_cache: dict = {}
+
+def _render_text(txt: str) -> pygame.Surface:
+    s = _text_cache.get(txt)
+    if s is None:
+        s = _get_font().render(txt, True, (210, 230, 255))
+        _text_cache[txt] = s
+    return s
+
+@functools.lru_cache(maxsize=1)
+def _get_probe_overlay() -> pygame.Surface:
+    """Transparent full-screen surface with the probe guide lines pre-drawn;
+    one blit per frame instead of three draw.line calls."""
+    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    for dx in DEFAULT_PROBES:
+        x = PLAYER_X + dx
+        pygame.draw.line(overlay, (90, 180, 255), (x, 0), (x, HEIGHT), 1)
+    return overlay
+
+@functools.lru_cache(maxsize=2)
+def _get_panel(panel_w: int, panel_h: int) -> pygame.Surface:
+    panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+    panel.fill((10, 20, 35, 160))
+    return panel
+
+def _draw_overlay(env: GGEnv, step_idx: int, action: Optional[int], obs: Optional[np.ndarray]):
+    # Draw extra overlay on top of env's render using current pygame surface.
+    # `obs` is the vector already returned by env.step/reset — no rebuild here.
     surf = pygame.display.get_surface()
     if surf is None:
         return
-    font = pygame.font.SysFont("jetbrainsmono", 16)
 
-    # Build obs for display (15-dim)
-    try:
-        # Use env internals to compute obs to avoid drift
-        obs = env._get_obs()
-        plat_rects = [p.rect for p in env.level.platforms] if env.level else []
-    except Exception:
-        obs = None
-        plat_rects = []
-
-    # Probe guide lines
-    for dx in DEFAULT_PROBES:
-        x = PLAYER_X + dx
-        pygame.draw.line(surf, (90, 180, 255), (x, 0), (x, HEIGHT), 1)
+    # Probe guide lines (pre-rendered once, single blit)
+    surf.blit(_get_probe_overlay(), (0, 0))
 
     # Panel
     lines: List[str] = []
@@ -119,17 +141,15 @@ def _draw_overlay(env: GGEnv, step_idx: int, action: Optional[int]):
             ceil_n, floor_n, st, sb = obs[b:b+4]
             lines.append(f"+{dx:>3}: ceil={ceil_n:.2f} floor={floor_n:.2f}  T={int(st)} B={int(sb)}")
 
-    # Translucent background
+    # Translucent background (cached; size only depends on the line count)
     panel_w = 360
     panel_h = 20 * (len(lines) + 1)
-    panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-    panel.fill((10, 20, 35, 160))
-    surf.blit(panel, (12, 12))
+    surf.blit(_get_panel(panel_w, panel_h), (12, 12))
 
-    # Text
+    # Text (memoized per string to skip re-rasterization)
     y0 = 18
     for i, txt in enumerate(lines):
-        surf.blit(font.render(txt, True, (210, 230, 255)), (20, y0 + i*20))
+        surf.blit(_render_text(txt), (20, y0 + i*20))
 
     pygame.display.flip()
 
@@ -137,33 +157,50 @@ def infer_seed_from_trace(path_str: str):
     m = re.search(r"seed_(\d+)", Path(path_str).name)
     return int(m.group(1)) if m else None
 
-def load_actions_from_trace(path_str: str):
+def load_actions_from_trace(path_str: str) -> np.ndarray:
     p = Path(path_str)
     if p.suffix.lower() == ".npy":
-        return np.load(p).astype(int).tolist()
+        # Keep the compact int8 array; no .tolist() boxing of every action
+        return np.load(p, allow_pickle=False).astype(np.int8, copy=False)
     raise ValueError(f"Unsupported trace format: {p.suffix} (expected .npy)")
 
+MAX_SPEED = 16
+
 def replay_episode(
     seed: int,
     actions: np.ndarray,
     frame_skip: int,
-    slow: bool = False
+    slow: bool = False,
+    speed: int = 1
 ):
     """
     Replays an episode deterministically using GGEnv v2 with on-screen overlay.
+    `speed` advances that many decision steps per drawn frame (fast-forward),
+    so a long episode can be skimmed without raising the display rate.
     Controls:
       SPACE: pause/resume   N: single-step when paused
-      R: restart episode    ESC: quit
+      R: restart episode    +/-: speed up / down    ESC: quit
     """
     env = GGEnv(render_mode="human", frame_skip=frame_skip)
+    env.auto_render = False  # we composite the overlay and present once per frame
     obs, info = env.reset(seed=seed)
-    env.render()
-    
+    env.render(present=False)
+
     paused = False
+    pause_drawn = False     # paused frame rendered once on entry, then we block
+    single_step = False     # N while paused: run one step, then re-pause
+    speed = max(1, min(int(speed), MAX_SPEED))
     step_idx = 0
     action: Optional[int] = None
     clock = pygame.time.Clock()
 
+    # Display target, decoupled from step pacing: frames are only drawn when
+    # the previous draw is at least a display period old, so loop iterations
+    # that outpace the target skip the render+overlay work entirely.
+    target_fps = 15 if slow else 60
+    draw_period_ms = 1000 // target_fps
+    last_draw_ms = -draw_period_ms
+
     try:
         running = True
         while running and step_idx < len(actions):
@@ -176,49 +213,82 @@ def replay_episode(
                         running = False
                     elif event.key == pygame.K_SPACE:
                         paused = not paused
-                    elif event.key == pygame.K_n:
-                        # single step when paused
-                        if paused:
-                            paused = False
-                            # fall through to one step; we'll re-pause after
-                            do_single = True
-                        else:
-                            do_single = False
-                        # handle after stepping
+                        pause_drawn = False
                     elif event.key == pygame.K_r:
                         obs, info = env.reset(seed=seed)
                         step_idx = 0
                         paused = False
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        speed = min(speed * 2, MAX_SPEED)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        speed = max(speed // 2, 1)
 
             if paused:
-                # Draw current frame with overlay and idle
-                env.render()
-                _draw_overlay(env, step_idx, action=None)
-                clock.tick(60)
+                # Draw the frozen frame once, then block on the event queue
+                # (zero CPU) instead of redrawing at 60 FPS.
+                if not pause_drawn:
+                    env.render(present=False)
+                    _draw_overlay(env, step_idx, action=None, obs=obs)
+                    pause_drawn = True
+
+                event = pygame.event.wait()
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_SPACE:
+                        paused = False
+                    elif event.key == pygame.K_n:
+                        # advance exactly one step, then re-pause
+                        single_step = True
+                        paused = False
+                    elif event.key == pygame.K_r:
+                        obs, info = env.reset(seed=seed)
+                        step_idx = 0
+                        paused = False
                 continue
 
-            # Step with next recorded action
-            action = int(actions[step_idx])
-            obs, r, term, trunc, info = env.step(action)
-
-            # Draw with overlay
-            env.render()
-            _draw_overlay(env, step_idx, action)
-
-            step_idx += 1
+            # Advance `speed` recorded steps per drawn frame (one when
+            # single-stepping), amortizing the render over the batch.
+            term = trunc = False
+            for _ in range(1 if single_step else speed):
+                if step_idx >= len(actions):
+                    break
+                action = int(actions[step_idx])
+                obs, r, term, trunc, info = env.step(action)
+                step_idx += 1
+                if term or trunc:
+                    break
+
+            # Draw with overlay only at the display target (single flip per
+            # drawn frame); terminal and single-stepped frames always draw.
+            now_ms = pygame.time.get_ticks()
+            if (now_ms - last_draw_ms >= draw_period_ms) or single_step or term or trunc:
+                env.render(present=False)
+                _draw_overlay(env, step_idx - 1, action, obs)
+                last_draw_ms = now_ms
+
+            if single_step:
+                single_step = False
+                paused = True
+                pause_drawn = True  # the frame we just presented is current
+                continue
 
-            # Re-pause if we just did a single-step
-            keys = pygame.key.get_pressed()
-            # (We detect N via event, but simple approach: hold no extra state.)
-            # Optional slow mode: cap to ~15 fps (decision rate) for readability
-            if slow:
-                clock.tick(15)
-            else:
-                clock.tick(60)
+            # Pacing: slow mode holds playback to ~decision rate for readability
+            clock.tick(target_fps)
 
             if term or trunc:
-                # Final frame is already drawn; wait a moment
-                pygame.time.delay(600)
+                # Final frame is already drawn; hold ~600ms while still pumping
+                # events so ESC/close work (no hard blocking sleep).
+                end_ticks = pygame.time.get_ticks() + 600
+                while pygame.time.get_ticks() < end_ticks:
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT or (
+                            event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+                        ):
+                            return
+                    clock.tick(60)
                 break
     finally:
         env.close()
@@ -235,6 +305,8 @@ def main():
     ap.add_argument("--frame-skip", type=int, default=-1,
                     help="Override frame_skip. If <0, use meta or default=4")
     ap.add_argument("--slow", action="store_true", help="Slow display (~15 fps) for readability")
+    ap.add_argument("--speed", type=int, default=1,
+                    help=f"Decision steps advanced per drawn frame (1..{MAX_SPEED}); +/- adjust live")
     args = ap.parse_args()
     policy_label = args.policy
     
@@ -277,9 +349,10 @@ def main():
                     pass
 
     print(f"Replaying seed={args.seed}  policy={policy_label}  steps={len(actions)}  frame_skip={fs}")
-    print("Controls: SPACE pause/resume | N step (when paused) | R restart | ESC quit")
+    print("Controls: SPACE pause/resume | N step (when paused) | R restart | +/- speed | ESC quit")
 
-    replay_episode(seed=args.seed, actions=actions, frame_skip=fs, slow=args.slow)
+    replay_episode(seed=args.seed, actions=actions, frame_skip=fs, slow=args.slow,
+                   speed=args.speed)
 
 if __name__ == "__main__":
     main()
@@ -14,48 +14,97 @@ Usage examples (from repo root):
 
   # Quick random-only smoke with fewer steps and no files:
   python -m experiments.sanity_rollout --policies random --steps 300 --out-dir /tmp/sanity --save-traces
+
+  # Fan the sweep out over 8 worker processes (one reused env per worker):
+  python -m experiments.sanity_rollout --policies both --workers 8
+
+The env is constructed once per process and re-worlded with reset(seed=...)
+per episode; nothing is rebuilt between episodes.
 """
 
 from __future__ import annotations
 import argparse
 import csv
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 import numpy as np
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # numba is optional; fall back to pure Python
+    HAS_NUMBA = False
+    def njit(*args, **kwargs):
+        def deco(fn):
+            return fn
+        return deco(args[0]) if (args and callable(args[0])) else deco
+
 from src.env.gg_env_v2 import GGEnv  # assumes you placed the env here
 
 
 # ------------------------ Policies ------------------------
 
-def random_policy_init(action_seed: int):
-    rng = np.random.RandomState(action_seed)
+def random_policy_init(action_seed: int, steps_limit: int):
+    # Draw the whole episode's actions in one vectorized call instead of one
+    # RNG round-trip per step. Same RandomState stream as the old per-step
+    # randint(0, 2), so existing traces stay reproducible.
+    acts = np.random.RandomState(action_seed).randint(0, 2, size=max(1, steps_limit)).astype(np.int8)
+    next_act = iter(acts).__next__
     def act(_obs: np.ndarray) -> int:
-        return int(rng.randint(0, 2))  # 0 or 1
+        return int(next_act())  # 0 or 1
     return act
 
+@njit(cache=True, fastmath=True)
+def _heuristic_act(obs: np.ndarray) -> np.int8:
+    """JIT-compiled core of the tiny heuristic (scalar comparisons on obs[2..6]).
+
+    Obs v2 layout reminder for anyone adding scored variants: obs[3:15] is
+    [ceil, floor, spikeTop, spikeBot] per probe (+120/+240/+360) — there is no
+    per-probe scalar "danger" channel. A weighted danger score should be built
+    from these blocks with a module-level float32 weight array so the fused
+    (weights * block).max() stays a single ufunc call per step.
+    """
+    grav = obs[2]  # +1 down, -1 up
+    # Near probe (+120) lives at indices 3..6
+    ceil_n, floor_n, spike_top, spike_bot = obs[3], obs[4], obs[5], obs[6]
+    if grav > 0:  # currently on bottom lane
+        cur_danger = (spike_bot == 1.0) or (floor_n >= 0.999)  # no floor sentinel
+        target_safe = (spike_top == 0.0) and (ceil_n > 0.0)    # ceiling exists & no spike
+    else:         # currently on top lane
+        cur_danger = (spike_top == 1.0) or (ceil_n <= 0.001)   # no ceiling sentinel
+        target_safe = (spike_bot == 0.0) and (floor_n < 1.0)   # floor exists & no spike
+    return np.int8(1) if (cur_danger and target_safe) else np.int8(0)
+
 def tiny_heuristic_policy_init():
     """
     Very small rule:
       - If gravity is down: flip only when bottom near-probe shows danger
         (bottom spike at +120 OR no floor at +120), and target lane not spiky at +120.
       - If gravity is up: mirror for top.
+    The comparisons run inside `_heuristic_act` (Numba-jitted when available).
     """
-    def act(obs: np.ndarray) -> int:
-        grav = obs[2]  # +1 down, -1 up
-        # Near probe (+120) lives at indices 3..6
-        ceil_n, floor_n, spike_top, spike_bot = obs[3], obs[4], obs[5], obs[6]
-        if grav > 0:  # currently on bottom lane
-            cur_danger = (spike_bot == 1.0) or (floor_n >= 0.999)  # no floor sentinel
-            target_safe = (spike_top == 0.0) and (ceil_n > 0.0)    # ceiling exists & no spike
-            return 1 if (cur_danger and target_safe) else 0
-        else:         # currently on top lane
-            cur_danger = (spike_top == 1.0) or (ceil_n <= 0.001)   # no ceiling sentinel
-            target_safe = (spike_bot == 0.0) and (floor_n < 1.0)   # floor exists & no spike
-            return 1 if (cur_danger and target_safe) else 0
-    return act
+    # Warm the JIT on the real float32[:] signature so compile cost is paid once,
+    # not inside the first episode's decision loop. The jitted kernel is the
+    # policy callable itself — no wrapper lambda or per-call int() re-box
+    # (int8 actions index the trace buffer and pass Discrete.contains as-is).
+    _heuristic_act(np.zeros(15, dtype=np.float32))
+    return _heuristic_act
+
+def heuristic_acts_batch(obs_mat: np.ndarray) -> np.ndarray:
+    """
+    Vectorized tiny heuristic over a (N, 15) obs matrix -> (N,) int8 actions.
+    Same rule as `_heuristic_act`, evaluated column-wise so N parallel envs
+    cost one Python-level dispatch per step instead of N.
+    """
+    grav = obs_mat[:, 2]
+    ceil_n, floor_n, st, sb = obs_mat[:, 3], obs_mat[:, 4], obs_mat[:, 5], obs_mat[:, 6]
+
+    flip_down = ((sb == 1.0) | (floor_n >= 0.999)) & ((st == 0.0) & (ceil_n > 0.0))
+    flip_up = ((st == 1.0) | (ceil_n <= 0.001)) & ((sb == 0.0) & (floor_n < 1.0))
+    return np.where(grav > 0, flip_down, flip_up).astype(np.int8)
 
 
 # ------------------------ Rollout core ------------------------
@@ -63,96 +112,117 @@ def tiny_heuristic_policy_init():
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
-def write_episode_row(csv_path: Path, header: List[str], row: List):
-    exists = csv_path.exists()
-    with csv_path.open("a", newline="") as f:
-        w = csv.writer(f)
-        if not exists:
-            w.writerow(header)
-        w.writerow(row)
-
-def run_one_episode(policy_name: str,
+def run_one_episode(env: GGEnv,
+                    policy_name: str,
                     seed: int,
-                    frame_skip: int,
                     steps_limit: int,
-                    save_traces: bool,
                     save_obs: bool,
-                    out_dir: Path) -> Tuple[int, float, float, bool, bool, Optional[str], float]:
+                    trace_prefix: Optional[str]) -> Tuple[int, float, float, bool, bool, Optional[str], float]:
     """
     Returns: (ep_len, ret_sum, distance_px, terminated, truncated, death_cause, grounded_ratio)
-    Also writes traces to disk if requested.
+    Writes traces to disk when trace_prefix (a pre-created "<dir>/" string) is given.
+
+    The env is shared across episodes (constructed once in main); reset(seed=...)
+    gives each episode a deterministic fresh world.
     """
-    # For fair parity with training cadence, let env carry its own time limit (30s default).
-    env = GGEnv(frame_skip=frame_skip)
+    frame_skip = env.frame_skip  # for the meta sidecar
+    save_traces = trace_prefix is not None
 
     # Policy init
     if policy_name == "random":
         # Make action RNG seed a function of seed for determinism
         action_seed = 10_000 + seed
-        policy = random_policy_init(action_seed)
+        policy = random_policy_init(action_seed, steps_limit)
     elif policy_name == "heuristic":
         action_seed = -1
         policy = tiny_heuristic_policy_init()
     else:
         raise ValueError("Unknown policy")
 
-    # Storage for replay
-    actions: List[int] = []
-    obs_list: List[np.ndarray] = [] if save_obs else []
+    # Storage for replay: preallocated, written by index (no per-step append/copy).
+    # Skipped entirely when traces are off; ep_len alone carries the step count.
+    actions: Optional[np.ndarray] = np.empty(steps_limit, dtype=np.int8) if save_traces else None
+    obs_buf: Optional[np.ndarray] = None
 
     ret_sum = 0.0
     grounded_count = 0
     ep_len = 0
     death_cause = None
 
-    try:
-        obs, info = env.reset(seed=seed)
-        if save_obs:
-            obs_list.append(obs.copy())
-
-        for t in range(steps_limit):
-            a = policy(obs)
-            actions.append(int(a))
+    obs, info = env.reset(seed=seed)
+    if save_obs:
+        obs_buf = np.empty((steps_limit + 1, obs.shape[0]), dtype=np.float32)
+        obs_buf[0] = obs  # ndarray assignment copies into the buffer
+
+    # The loop body itself cannot go @njit: env.step runs Python/pygame code,
+    # and pushing the few scalar ops around it through a jitted helper would
+    # pay a numba boundary crossing per step for nothing. The policy math is
+    # already compiled (_heuristic_act); here we just strip Python dispatch.
+    env_step = env.step
+    for t in range(steps_limit):
+        a = policy(obs)  # 0/1 (plain int or np.int8; both index and step fine)
+        if actions is not None:
+            actions[t] = a
+
+        # When recording obs, the env writes row t+1 of obs_buf in place.
+        obs, r, term, trunc, info = env_step(
+            a, out=obs_buf[t + 1] if obs_buf is not None else None)
+        ret_sum += r  # reward is already a Python float
+        ep_len += 1
+        if env.last_grounded:  # typed attribute, no dict hash per step
+            grounded_count += 1
+
+        if term or trunc:
+            break
+
+    # Episode-level fields only need one read, straight off the env
+    death_cause = env.death_cause
+    distance_px = float(env.distance_px)
+    terminated = bool(term)
+    truncated = bool(trunc)
+    grounded_ratio = grounded_count / max(1, ep_len)
+
+    # Save traces (trace_prefix points into the dir pre-created in main())
+    if save_traces:
+        # allow_pickle=False: traces are plain int8/float32, skip the
+        # pickle-aware path and keep the files loadable with the same flag.
+        np.save(f"{trace_prefix}{seed}_actions.npy", actions[:ep_len], allow_pickle=False)
+        if save_obs and obs_buf is not None:
+            np.save(f"{trace_prefix}{seed}_obs.npy", obs_buf[:ep_len + 1], allow_pickle=False)
+
+        # Also write a tiny metadata sidecar for convenience (one preformatted
+        # string, no per-field join)
+        meta = (
+            f"seed={seed}\n"
+            f"frame_skip={frame_skip}\n"
+            f"policy={policy_name}\n"
+            f"action_rng_seed={action_seed}\n"
+            f"steps_limit={steps_limit}"
+        )
+        with open(f"{trace_prefix}{seed}_meta.txt", "wb") as mf:
+            mf.write(meta.encode())
 
-            obs, r, term, trunc, info = env.step(a)
-            ret_sum += float(r)
-            ep_len += 1
-            grounded_count += int(bool(info.get("grounded", False)))
-            death_cause = info.get("death_cause", None)
+    return ep_len, ret_sum, distance_px, terminated, truncated, death_cause, grounded_ratio
 
-            if save_obs:
-                obs_list.append(obs.copy())
 
-            if term or trunc:
-                break
+# Per-process env for --workers: each pool worker builds one GGEnv lazily and
+# reuses it across the episodes it is handed.
+_worker_env: Optional[GGEnv] = None
 
-        distance_px = float(info.get("distance_px", 0.0))
-        terminated = bool(term)
-        truncated = bool(trunc)
-        grounded_ratio = grounded_count / max(1, ep_len)
+def _episode_job(job: Tuple):
+    """Top-level (picklable) worker: runs one episode and returns its stats."""
+    global _worker_env
+    policy_name, seed, frame_skip, steps_limit, save_obs, trace_prefix = job
+    if _worker_env is None or _worker_env.frame_skip != frame_skip:
+        if _worker_env is not None:
+            _worker_env.close()
+        _worker_env = GGEnv(frame_skip=frame_skip)
+    return run_one_episode(_worker_env, policy_name, seed, steps_limit, save_obs, trace_prefix)
 
-    finally:
-        env.close()
-
-    # Save traces
-    if save_traces:
-        trace_dir = out_dir / "traces" / policy_name
-        ensure_dir(trace_dir)
-        np.save(trace_dir / f"{seed}_actions.npy", np.asarray(actions, dtype=np.int8))
-        if save_obs:
-            np.save(trace_dir / f"{seed}_obs.npy", np.asarray(obs_list, dtype=np.float32))
-
-        # Also write a tiny metadata sidecar for convenience
-        meta_lines = [
-            f"seed={seed}",
-            f"frame_skip={frame_skip}",
-            f"policy={policy_name}",
-            f"action_rng_seed={action_seed}",
-            f"steps_limit={steps_limit}",
-        ]
-        (trace_dir / f"{seed}_meta.txt").write_text("\n".join(meta_lines), encoding="utf-8")
-
-    return ep_len, ret_sum, distance_px, terminated, truncated, death_cause, grounded_ratio
+def _run_serial(env: GGEnv, job: Tuple):
+    """Run one job on the shared serial env (same job tuple as _episode_job)."""
+    policy_name, seed, _frame_skip, steps_limit, save_obs, trace_prefix = job
+    return run_one_episode(env, policy_name, seed, steps_limit, save_obs, trace_prefix)
 
 
 def main():
@@ -172,6 +242,8 @@ def main():
                     help="Save action sequences (and optional obs) for replay")
     ap.add_argument("--save-obs", action="store_true",
                     help="Also save observations per step (larger files)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Process-pool size for the episode sweep (1 = serial)")
     args = ap.parse_args()
 
     out_dir = Path(args.out_dir)
@@ -206,17 +278,48 @@ def main():
           f"(frame_skip={args.frame_skip}, decision_hz≈{decision_hz:.1f})")
     print(f"Writing summaries to {episodes_csv} and traces under {out_dir}/traces/")
 
+    # Build the (policy, seed) job list up front; episodes are independent, so
+    # they can run serially on one shared env or fan out to a process pool.
+    jobs: List[Tuple] = []
     for policy_name in to_run:
+        trace_prefix = None
+        if args.save_traces:
+            # mkdir once per policy, not once per episode, and freeze the
+            # path prefix so episode saves do plain string concatenation
+            trace_dir = out_dir / "traces" / policy_name
+            ensure_dir(trace_dir)
+            trace_prefix = str(trace_dir) + os.sep
         for seed in seeds:
-            ep_len, ret_sum, dist, terminated, truncated, death_cause, g_ratio = run_one_episode(
-                policy_name=policy_name,
-                seed=seed,
-                frame_skip=args.frame_skip,
-                steps_limit=args.steps,
-                save_traces=args.save_traces,
-                save_obs=args.save_obs,
-                out_dir=out_dir
-            )
+            jobs.append((policy_name, seed, args.frame_skip, args.steps,
+                         args.save_obs, trace_prefix))
+
+    # Open the CSV once for the whole run (header only on creation), instead of
+    # re-opening + stat'ing the file for every episode row. The CSV is written
+    # only from this process, also when using workers.
+    csv_is_new = not episodes_csv.exists()
+    # 1 MiB buffer: a whole sweep's rows fit, so writes coalesce to ~one syscall
+    csv_file = episodes_csv.open("a", newline="", buffering=1 << 20)
+    env: Optional[GGEnv] = None
+    try:
+        csv_writer = csv.writer(csv_file)
+        if csv_is_new:
+            csv_writer.writerow(header)
+
+        if args.workers > 1:
+            # One worker process per core (capped by jobs); ex.map preserves
+            # job order, so rows land in the same order as a serial run.
+            with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as ex:
+                results = ex.map(_episode_job, jobs)
+                job_results = zip(jobs, results)
+        else:
+            # Serial: one env for the whole run; reset(seed=...) re-worlds it
+            # per episode. (Time limit stays the env default of 30s.)
+            env = GGEnv(frame_skip=args.frame_skip)
+            job_results = ((job, _run_serial(env, job)) for job in jobs)
+
+        for job, result in job_results:
+            policy_name, seed = job[0], job[1]
+            ep_len, ret_sum, dist, terminated, truncated, death_cause, g_ratio = result
 
             row = [
                 env_name, env_version, obs_version,
@@ -226,10 +329,16 @@ def main():
                 int(terminated), int(truncated), (death_cause or ""),
                 f"{g_ratio:.3f}",
             ]
-            write_episode_row(episodes_csv, header, row)
+            # Buffered: rows hit disk via the io layer's buffer and the
+            # close() in the finally block, not a flush syscall per episode.
+            csv_writer.writerow(row)
 
             print(f"[{policy_name}] seed={seed}  len={ep_len}  dist={dist:.1f}  "
                   f"ret={ret_sum:.1f}  term={terminated} trunc={truncated}  cause={death_cause}")
+    finally:
+        csv_file.close()
+        if env is not None:
+            env.close()
 
     print("✓ Sanity rollouts complete")
 
@@ -0,0 +1,48 @@
+# src/env/_level_kernel.py
+"""
+Compiled in-place shift of LevelGen's SoA mirrors.
+
+On frames with no platform/spike set change, the whole world translates left
+by dx; `shift_soa` applies that to the platform coordinate block and the
+spike triangle/AABB arrays in one fused pass instead of five separate NumPy
+slice ops. Integer arithmetic only — bit-exact by construction.
+
+numba is optional — without it LevelGen keeps the NumPy slice path.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def deco(fn):
+            return fn
+        return deco(args[0]) if (args and callable(args[0])) else deco
+
+
+@njit(cache=True)
+def shift_soa(plat_coords, spike_tri, spike_aabb, dx):
+    """Translate plat_coords (n,4), spike_tri (s,3,2) and spike_aabb (s,4)
+    left by dx in place (x columns only; y is handled by the caller for the
+    few rows owned by moving platforms)."""
+    for i in range(plat_coords.shape[0]):
+        plat_coords[i, 0] -= dx
+        plat_coords[i, 2] -= dx
+    for i in range(spike_tri.shape[0]):
+        spike_tri[i, 0, 0] -= dx
+        spike_tri[i, 1, 0] -= dx
+        spike_tri[i, 2, 0] -= dx
+        spike_aabb[i, 0] -= dx
+        spike_aabb[i, 2] -= dx
+
+
+def warmup_level_kernel():
+    """Trigger JIT compilation on tiny arrays so the first frame doesn't pay it."""
+    shift_soa(np.zeros((1, 4), dtype=np.int32),
+              np.zeros((1, 3, 2), dtype=np.int32),
+              np.zeros((1, 4), dtype=np.int32), 0)
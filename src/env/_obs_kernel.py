@@ -0,0 +1,125 @@
+# src/env/_obs_kernel.py
+"""
+Compiled probe scan for observation v2.
+
+`probe_kernel` computes the 12 per-probe features (ceil/floor/spikeTop/
+spikeBot at each lookahead x) from LevelGen's SoA columns in one typed
+nopython pass, writing straight into the caller's float32 buffer. The scalar
+head of the observation (y, vy, grav) stays with the builder.
+
+numba is optional; `HAS_NUMBA` lets the builder keep its vectorized NumPy
+path as the fallback instead of running these loops interpreted.
+No fastmath: feature values must stay bit-identical to the NumPy path.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def deco(fn):
+            return fn
+        return deco(args[0]) if (args and callable(args[0])) else deco
+
+
+@njit(cache=True)
+def probe_kernel(y, vy, grav_dir, y_denom, max_vy,
+                 p_left, p_top, p_right, p_bottom, p_is_upper,
+                 spike_cx, spike_is_top,
+                 xs, cover_hi, spike_window, height, out):
+    """Build the whole observation vector in one compiled pass.
+
+    out[0:3] is the scalar head — clamped y_top/y_denom, vy clipped to
+    [-max_vy, max_vy] and scaled, and the gravity sign — followed by
+    [ceil, floor, spikeTop, spikeBot] blocks per probe.
+
+    Same rules and sentinels as the NumPy path: ceiling is the min bottom of
+    covering upper platforms (sentinel 0.0), floor the max top of covering
+    lower ones (sentinel 1.0), both clamped to [0,1] after dividing by height;
+    spike flags are presence within ±spike_window of the probe x, by lane.
+
+    `cover_hi[j]` is searchsorted(p_left, xs[j], side="right"): generation
+    appends platforms left-to-right and culling pops the front, so both
+    p_left and p_right are non-decreasing. Platforms covering a probe are
+    therefore the contiguous run just below cover_hi — walk back until
+    right <= px instead of scanning the whole list.
+    """
+    v = y / y_denom
+    out[0] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+    vv = max(-max_vy, min(vy, max_vy))
+    out[1] = vv / max_vy
+    out[2] = 1.0 if grav_dir > 0.0 else -1.0
+
+    for j in range(xs.shape[0]):
+        px = xs[j]
+        k = 3 + 4 * j
+
+        ceil_y = 2 * height
+        floor_y = -height
+        has_ceil = False
+        has_floor = False
+        i = cover_hi[j] - 1
+        while i >= 0 and p_right[i] > px:
+            if p_is_upper[i]:
+                if p_bottom[i] < ceil_y:
+                    ceil_y = p_bottom[i]
+                has_ceil = True
+            else:
+                if p_top[i] > floor_y:
+                    floor_y = p_top[i]
+                has_floor = True
+            i -= 1
+
+        if has_ceil:
+            v = ceil_y / height
+            out[k] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+        else:
+            out[k] = 0.0   # "no ceiling" sentinel
+        if has_floor:
+            v = floor_y / height
+            out[k + 1] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+        else:
+            out[k + 1] = 1.0  # "no floor" sentinel
+
+        st = 0.0
+        sb = 0.0
+        for i in range(spike_cx.shape[0]):
+            d = spike_cx[i] - px
+            if -spike_window <= d <= spike_window:
+                if spike_is_top[i]:
+                    st = 1.0
+                else:
+                    sb = 1.0
+        out[k + 2] = st
+        out[k + 3] = sb
+
+
+# Prefer the AOT-built kernel when present (tools/build_obs_aot.py): same
+# code, but a cold process pays no JIT compile on its first step.
+_probe_kernel_jit = probe_kernel  # kept for the AOT build tool / rebuilds
+try:
+    from src.env._gg_obs_aot import probe_kernel as _aot_probe_kernel
+    probe_kernel = _aot_probe_kernel
+    HAS_NUMBA = True  # AOT build works even if numba itself is absent
+except ImportError:
+    pass
+
+
+def warmup_probe_kernel():
+    """Compile probe_kernel on the real array layouts (strided SoA columns)
+    so the first env step doesn't pay JIT latency. No-op cost when the AOT
+    module is loaded."""
+    coords = np.zeros((1, 4), dtype=np.int32)
+    tri = np.zeros((1, 3, 2), dtype=np.int32)
+    probe_kernel(0.0, 0.0, 1.0, 1.0, 1.0,
+                 coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3],
+                 np.zeros(1, dtype=bool),
+                 tri[:, 2, 0], np.zeros(1, dtype=bool),
+                 np.zeros(3, dtype=np.int32), np.zeros(3, dtype=np.int64),
+                 1, 1,
+                 np.zeros(15, dtype=np.float32))
@@ -0,0 +1,140 @@
+# src/env/_spike_kernel.py
+"""
+Compiled spike death test.
+
+`any_spike_hits` runs the strict rect-vs-triangle test from
+src.game.level over every spike in one nopython pass: AABB prefilter
+inline, early exit on the first hit, no candidate array allocated. The
+geometry comes from LevelGen's SoA mirrors (spike_tri / spike_aabb).
+
+numba is optional; `HAS_NUMBA` lets callers keep the interpreted
+candidate scan as the fallback. No fastmath: the verdict must match
+rect_intersects_triangle_strict exactly.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def deco(fn):
+            return fn
+        return deco(args[0]) if (args and callable(args[0])) else deco
+
+
+@njit(cache=True)
+def _point_in_triangle_strict(px, py, ax, ay, bx, by, cx, cy, eps):
+    # Same barycentric test as level._point_in_triangle_strict.
+    v0x = cx - ax
+    v0y = cy - ay
+    v1x = bx - ax
+    v1y = by - ay
+    v2x = px - ax
+    v2y = py - ay
+    dot00 = v0x * v0x + v0y * v0y
+    dot01 = v0x * v1x + v0y * v1y
+    dot02 = v0x * v2x + v0y * v2y
+    dot11 = v1x * v1x + v1y * v1y
+    dot12 = v1x * v2x + v1y * v2y
+    denom = dot00 * dot11 - dot01 * dot01
+    if abs(denom) < 1e-8:
+        return False
+    inv = 1.0 / denom
+    u = (dot11 * dot02 - dot01 * dot12) * inv
+    v = (dot00 * dot12 - dot01 * dot02) * inv
+    return (u > eps) and (v > eps) and (u + v < 1.0 - eps)
+
+
+@njit(cache=True)
+def _segs_intersect_strict(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y, eps):
+    rx = p2x - p1x
+    ry = p2y - p1y
+    sx = p4x - p3x
+    sy = p4y - p3y
+    denom = rx * sy - ry * sx
+    if abs(denom) < 1e-8:
+        return False
+    qx = p3x - p1x
+    qy = p3y - p1y
+    t = (qx * sy - qy * sx) / denom
+    u = (qx * ry - qy * rx) / denom
+    return (eps < t < 1.0 - eps) and (eps < u < 1.0 - eps)
+
+
+@njit(cache=True)
+def _rect_tri_strict(rl, rt, rr, rb, ax, ay, bx, by, cx, cy, eps):
+    # 1) rect corners strictly inside the triangle
+    if (_point_in_triangle_strict(rl, rt, ax, ay, bx, by, cx, cy, eps)
+            or _point_in_triangle_strict(rr, rt, ax, ay, bx, by, cx, cy, eps)
+            or _point_in_triangle_strict(rr, rb, ax, ay, bx, by, cx, cy, eps)
+            or _point_in_triangle_strict(rl, rb, ax, ay, bx, by, cx, cy, eps)):
+        return True
+
+    # 2) triangle vertex strictly inside the rect (edges excluded)
+    if ((rl + eps) < ax < (rr - eps) and (rt + eps) < ay < (rb - eps)):
+        return True
+    if ((rl + eps) < bx < (rr - eps) and (rt + eps) < by < (rb - eps)):
+        return True
+    if ((rl + eps) < cx < (rr - eps) and (rt + eps) < cy < (rb - eps)):
+        return True
+
+    # 3) strict edge intersections (triangle edges vs rect edges)
+    for k in range(3):
+        if k == 0:
+            e1x0, e1y0, e1x1, e1y1 = ax, ay, bx, by
+        elif k == 1:
+            e1x0, e1y0, e1x1, e1y1 = bx, by, cx, cy
+        else:
+            e1x0, e1y0, e1x1, e1y1 = cx, cy, ax, ay
+        if (_segs_intersect_strict(e1x0, e1y0, e1x1, e1y1, rl, rt, rr, rt, eps)
+                or _segs_intersect_strict(e1x0, e1y0, e1x1, e1y1, rr, rt, rr, rb, eps)
+                or _segs_intersect_strict(e1x0, e1y0, e1x1, e1y1, rr, rb, rl, rb, eps)
+                or _segs_intersect_strict(e1x0, e1y0, e1x1, e1y1, rl, rb, rl, rt, eps)):
+            return True
+
+    return False
+
+
+@njit(cache=True)
+def any_spike_hits(pl, pt, pr, pb, tri, aabb):
+    """True if any spike triangle strictly overlaps the player rect.
+
+    (pl, pt, pr, pb) are the undeflated player rect bounds; tri is the
+    (N, 3, 2) world-space triangle array, aabb the matching (N, 4)
+    (x0, y0, x1, y1) boxes. The AABB prefilter uses the same strict
+    overlap rule as Rect.colliderect, and the narrow test mirrors
+    rect_intersects_triangle_strict including its inflate(-2, -2)
+    deflation and eps=0.5.
+    """
+    # pygame r.inflate(-2, -2): left/top move in by 1, right/bottom by 1
+    rl = float(pl + 1)
+    rt = float(pt + 1)
+    rr = float(pr - 1)
+    rb = float(pb - 1)
+    eps = 0.5
+    for i in range(tri.shape[0]):
+        if not (aabb[i, 0] < pr and aabb[i, 2] > pl
+                and aabb[i, 1] < pb and aabb[i, 3] > pt):
+            continue
+        ax = float(tri[i, 0, 0])
+        ay = float(tri[i, 0, 1])
+        bx = float(tri[i, 1, 0])
+        by = float(tri[i, 1, 1])
+        cx = float(tri[i, 2, 0])
+        cy = float(tri[i, 2, 1])
+        if _rect_tri_strict(rl, rt, rr, rb, ax, ay, bx, by, cx, cy, eps):
+            return True
+    return False
+
+
+def warmup_spike_kernel():
+    """Compile any_spike_hits on the real array layouts so the first env
+    step doesn't pay JIT latency."""
+    any_spike_hits(0, 0, 1, 1,
+                   np.zeros((1, 3, 2), dtype=np.int32),
+                   np.zeros((1, 4), dtype=np.int32))
@@ -0,0 +1,78 @@
+# src/env/_substep.py
+"""
+Compiled scalar core of the physics sub-step.
+
+`integrate_substep` is the pure-arithmetic half of Player.update_physics
+(cooldown decay, gravity, velocity clamp, position integration, contact-buffer
+decay) expressed as a free function over plain floats so numba can compile it.
+`sweep_platforms` is the search half of the fresh-collision sweep over
+LevelGen's SoA columns: it finds the first crossing platform and returns its
+index, while the snap and moving-platform bookkeeping (object identity,
+`last_dy`, `_standing_on_platform`) stay in Player.
+
+numba is optional — without it the same functions run as plain Python.
+No fastmath: results must stay bit-identical to the interpreted arithmetic so
+recorded action traces keep replaying exactly.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def deco(fn):
+            return fn
+        return deco(args[0]) if (args and callable(args[0])) else deco
+
+
+@njit(cache=True)
+def integrate_substep(y: float, vy: float, grav_dir: float,
+                      flip_cooldown: float, contact_buffer: float,
+                      dt: float, g_abs: float, max_vy: float):
+    """One integration sub-step; returns (y, vy, flip_cooldown, contact_buffer).
+
+    Must mirror the original Player.update_physics statements exactly, in the
+    same order, including the clamp style.
+    """
+    if flip_cooldown > 0.0:
+        flip_cooldown = max(0.0, flip_cooldown - dt)
+
+    # Apply gravity
+    vy += grav_dir * g_abs * dt
+
+    # Clamp vertical speed
+    vy = max(-max_vy, min(max_vy, vy))
+
+    # Integrate position
+    y += vy * dt
+
+    # Update platform contact buffer
+    if contact_buffer > 0.0:
+        contact_buffer = max(0.0, contact_buffer - dt)
+
+    return y, vy, flip_cooldown, contact_buffer
+
+
+@njit(cache=True)
+def sweep_platforms(check_left, check_right, body_top, body_bottom, vy,
+                    grav_down, p_left, p_top, p_right, p_bottom):
+    """Index of the first platform the player is crossing, or -1.
+
+    Same order and predicates as the interpreted sweep in
+    Player.resolve_collisions_with_platforms: horizontal overlap of the
+    tolerance-deflated check rect, then the grav-signed top/bottom crossing
+    test including the vy direction gate.
+    """
+    for i in range(p_left.shape[0]):
+        if check_right <= p_left[i] or check_left >= p_right[i]:
+            continue
+        if grav_down:
+            if body_bottom >= p_top[i] and body_top < p_top[i] and vy >= 0.0:
+                return i
+        else:
+            if body_top <= p_bottom[i] and body_bottom > p_bottom[i] and vy <= 0.0:
+                return i
+    return -1
@@ -11,9 +11,12 @@ from src.game.config import (
     SCROLL_PX_PER_S,
     COLOR_BG, COLOR_PLAT, COLOR_ACCENT, COLOR_DANGER
 )
-from src.game.level import LevelGen, rect_intersects_triangle_strict
+from src.game.level import LevelGen
 from src.game.player import Player
-from src.env.observations_v2 import build_observation_v2
+from src.env.observations_v2 import build_observation_v2_soa
+from src.env._obs_kernel import HAS_NUMBA, warmup_probe_kernel
+from src.env._spike_kernel import HAS_NUMBA as HAS_SPIKE_KERNEL, warmup_spike_kernel
+from src.env._level_kernel import HAS_NUMBA as HAS_LEVEL_KERNEL, warmup_level_kernel
 
 
 class GGEnv(gym.Env):
@@ -28,15 +31,23 @@ class GGEnv(gym.Env):
     def __init__(self,
                  render_mode: Optional[str] = None,
                  frame_skip: int = 4,
-                 time_limit_seconds: Optional[float] = 30.0):
+                 time_limit_seconds: Optional[float] = 30.0,
+                 obs_backend: str = "numpy"):
         super().__init__()
         assert frame_skip >= 1, "frame_skip must be >= 1"
+        assert obs_backend in ("numpy", "torch"), f"Unknown obs_backend {obs_backend!r}"
         self.render_mode = render_mode
         self.frame_skip = int(frame_skip)
+        # When True (default) and render_mode == "human", step() renders
+        # automatically. Tools that composite overlays set this to False and
+        # drive render(present=False) + a single flip themselves.
+        self.auto_render = True
 
         # Internal sim timing
         self.sim_fps = 60
         self.dt = 1.0 / self.sim_fps
+        # Distance advanced per sub-step (constant — hoisted out of the loop)
+        self._scroll_per_sub = SCROLL_PX_PER_S * self.dt
 
         # Optional built-in truncation (you can also use a TimeLimit wrapper)
         self.time_limit_decisions = None
@@ -57,6 +68,27 @@ class GGEnv(gym.Env):
         high = np.array([1.0,  1.0,  1.0] + [1.0, 1.0, 1.0, 1.0] * 3, dtype=np.float32)
         self.observation_space = gym.spaces.Box(low=low, high=high, dtype=np.float32)
 
+        # Persistent observation buffer: _get_obs fills it in place each
+        # decision step, so the default path allocates nothing. The returned
+        # array is overwritten by the next step/reset (standard vec-env
+        # convention) — callers that keep observations must copy.
+        #
+        # With obs_backend="torch" the buffer is the numpy view of a CPU torch
+        # tensor, so the same writer fills it and reset/step return the tensor
+        # without a host-host copy (pinned when CUDA is present, for async
+        # H2D). Opt-in: torch observations are outside the Box space, so
+        # gymnasium's checker only sees the default backend.
+        self.obs_backend = obs_backend
+        self._obs_t = None
+        if obs_backend == "torch":
+            import torch  # optional dependency, only needed for this backend
+            self._obs_t = torch.empty(self.observation_space.shape,
+                                      dtype=torch.float32,
+                                      pin_memory=torch.cuda.is_available())
+            self._obs_buf = self._obs_t.numpy()
+        else:
+            self._obs_buf = np.empty(self.observation_space.shape, dtype=np.float32)
+
         # --- Runtime state ---
         self.level: Optional[LevelGen] = None
         self.player: Optional[Player] = None
@@ -74,6 +106,14 @@ class GGEnv(gym.Env):
         # Will be set by Gymnasium when calling reset(seed=...)
         self.np_random = None  # type: ignore[attr-defined]
 
+        # Pay kernel JIT compilation here, not on the first step
+        if HAS_NUMBA:
+            warmup_probe_kernel()
+        if HAS_SPIKE_KERNEL:
+            warmup_spike_kernel()
+        if HAS_LEVEL_KERNEL:
+            warmup_level_kernel()
+
     # -------------------- Core API --------------------
 
     def reset(self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
@@ -84,8 +124,12 @@ class GGEnv(gym.Env):
         # - If not, let LevelGen randomize internally (None).
         level_seed = int(seed) if seed is not None else None
 
-        # Fresh world
-        self.level = LevelGen(level_seed)
+        # Fresh world; the LevelGen instance is reused across episodes — its
+        # in-place reset reproduces the exact stream of a fresh LevelGen(seed)
+        if self.level is None:
+            self.level = LevelGen(level_seed)
+        else:
+            self.level.reset(level_seed)
         self.player = Player(
             x=float(PLAYER_X),
             y=HEIGHT / 2 - PLAYER_H / 2,   # TOP-based convention
@@ -110,7 +154,7 @@ class GGEnv(gym.Env):
         info = {"seed": self.current_seed, "distance_px": self.distance_px}
         return obs, info
 
-    def step(self, action: int):
+    def step(self, action: int, out: Optional[np.ndarray] = None):
         assert self.action_space.contains(action), f"Invalid action {action}"
         assert self.level is not None and self.player is not None
 
@@ -125,11 +169,16 @@ class GGEnv(gym.Env):
         for _ in range(self.frame_skip):
             # Update world
             self.level.update_and_generate(self.dt)
-            self.player.update_physics(self.dt)
-            grounded, _ = self.player.resolve_collisions_with_platforms(self.level.platforms)
+            # Collision sweep on the SoA bounds: windowed by binary search
+            # and compiled (see Player.resolve_collisions_soa).
+            grounded, _ = self.player.update_and_collide_soa(self.dt, self.level)
+
+            # Player rect for this sub-step, built once and shared by the
+            # death tests (each pygame.Rect(...) is a fresh C allocation)
+            pr = self._player_rect()
 
             # Spike (strict) + OOB deaths
-            if self._check_spike_death():
+            if self._check_spike_death(pr):
                 self.alive = False
                 self.death_cause = "spike"
                 died_this_step = True
@@ -139,7 +188,7 @@ class GGEnv(gym.Env):
                 died_this_step = True
 
             # Progress distance every sub-step (regardless of alive/dead)
-            self.distance_px += SCROLL_PX_PER_S * self.dt
+            self.distance_px += self._scroll_per_sub
 
             if died_this_step:
                 break
@@ -154,7 +203,13 @@ class GGEnv(gym.Env):
         if (self.time_limit_decisions is not None) and (self.timestep >= self.time_limit_decisions):
             truncated = True
 
-        obs = self._get_obs()
+        # With `out` provided, the observation is written into the caller's
+        # float32 buffer (e.g. a preallocated trace row) instead of a fresh array.
+        # Mirror per-step state on the env so hot callers can read typed
+        # attributes instead of hashing into the info dict.
+        self.last_grounded = grounded
+
+        obs = self._get_obs(out=out)
         info = {
             "distance_px": self.distance_px,
             "timestep": self.timestep,
@@ -164,17 +219,22 @@ class GGEnv(gym.Env):
         }
 
         # Optional on-screen render
-        if self.render_mode == "human":
+        if self.render_mode == "human" and self.auto_render:
             self.render()
 
         return obs, reward, terminated, truncated, info
 
     # -------------------- Helpers --------------------
 
-    def _get_obs(self) -> np.ndarray:
+    def _get_obs(self, out: Optional[np.ndarray] = None):
         assert self.level is not None and self.player is not None
-        plat_rects: List[pygame.Rect] = [p.rect for p in self.level.platforms]
-        return build_observation_v2(self.player, plat_rects, self.level.spikes)
+        # SoA fast path: features are written straight into the caller's
+        # buffer (or the env's persistent one) — no per-step allocation.
+        obs = build_observation_v2_soa(self.player, self.level,
+                                       out=out if out is not None else self._obs_buf)
+        if out is None and self._obs_t is not None:
+            return self._obs_t  # shares memory with the buffer just filled
+        return obs
 
     def _player_rect(self) -> pygame.Rect:
         assert self.player is not None
@@ -185,15 +245,15 @@ class GGEnv(gym.Env):
             PLAYER_H
         )
 
-    def _check_spike_death(self) -> bool:
-        """Strict triangle vs rect death test, aligned with the game."""
+    def _check_spike_death(self, pr: pygame.Rect) -> bool:
+        """Strict triangle vs rect death test, aligned with the game.
+
+        Delegates to LevelGen.any_spike_hit: one compiled pass over the SoA
+        spike arrays when numba is present, interpreted candidate scan
+        otherwise — same verdict either way.
+        """
         assert self.level is not None
-        pr = self._player_rect()
-        for sp in self.level.spikes:
-            tri = sp.world_points()
-            if sp.aabb().colliderect(pr) and rect_intersects_triangle_strict(pr, tri):
-                return True
-        return False
+        return self.level.any_spike_hit(pr)
 
     def _out_of_bounds(self) -> bool:
         assert self.player is not None
@@ -201,7 +261,10 @@ class GGEnv(gym.Env):
 
     # -------------------- Rendering --------------------
 
-    def render(self):
+    def render(self, present: bool = True):
+        """Draw the current state. With present=False the frame is drawn but not
+        flipped to the display, so a caller can composite overlays and present
+        once (avoids double pygame.display.flip per frame)."""
         if self.render_mode is None:
             return
 
@@ -224,16 +287,21 @@ class GGEnv(gym.Env):
 
         if self.player is not None:
             color = COLOR_ACCENT if self.alive else COLOR_DANGER
-            pygame.draw.rect(self.screen, color, self._player_rect())
+            # Solid rect: fill() is the direct SDL_FillRect path
+            self.screen.fill(color, self._player_rect())
 
-        pygame.display.flip()
-        if self.clock is not None:
-            self.clock.tick(self.metadata.get("render_fps", 60))
+        if present:
+            pygame.display.flip()
+            if self.clock is not None:
+                self.clock.tick(self.metadata.get("render_fps", 60))
 
         if self.render_mode == "rgb_array":
-            # Return an (H, W, 3) uint8 array
-            arr = pygame.surfarray.array3d(self.screen)  # (W, H, 3)
-            return np.transpose(arr, (1, 0, 2))
+            # Return an (H, W, 3) uint8 array. tobytes already emits rows in
+            # HWC order, so this is one copy with no transposed strides
+            # (array3d + np.transpose produced a non-contiguous view of an
+            # extra (W, H, 3) allocation).
+            raw = pygame.image.tobytes(self.screen, "RGB")
+            return np.frombuffer(raw, dtype=np.uint8).reshape(HEIGHT, WIDTH, 3)
 
     def close(self):
         if self.screen is not None:
@@ -0,0 +1,139 @@
+# src/env/gg_vec_env.py
+from __future__ import annotations
+from typing import List, Optional, Sequence
+
+import numpy as np
+import gymnasium as gym
+
+from src.env.gg_env_v2 import GGEnv
+
+
+class GGVecEnv:
+    """
+    Synchronous batch of N GGEnv instances with an EnvPool/gym3-style API:
+    one `step(actions)` call advances all sub-envs and returns stacked arrays.
+
+    - Observations live in one preallocated (N, 15) float32 buffer; each
+      sub-env writes its row in place (GGEnv.step's `out=` path), so a full
+      batch step allocates nothing on the obs side.
+    - Rewards / terminated / truncated / distance / grounded are SoA arrays,
+      so the policy side can stay fully vectorized (see
+      experiments.sanity_rollout.heuristic_acts_batch).
+    - Auto-reset: a sub-env that terminates or truncates is reset in place on
+      the same step and returns its new episode's first observation; the
+      pre-reset episode stats are exposed via `final_*` arrays.
+
+    The simulation itself stays the per-env GGEnv step so batched dynamics are
+    exactly the single-env dynamics; the batching amortizes everything around
+    it (dispatch, obs stacking, bookkeeping) across N.
+
+    A full EnvPool-style port — (N,) arrays for y/vy/grav_dir stepped as one
+    NumPy expression, padded per-env platform layouts for a batched probe
+    kernel — was considered and rejected: flip eligibility and collision
+    resolution depend on platform object identity (moving-platform carry via
+    last_dy, contact buffers), so array physics would fork the dynamics the
+    game and recorded traces define. The per-env hot path is already compiled
+    (see _substep/_obs_kernel); this wrapper keeps batching at the layer where
+    exactness is free.
+    """
+
+    def __init__(self,
+                 num_envs: int,
+                 frame_skip: int = 4,
+                 time_limit_seconds: Optional[float] = 30.0,
+                 auto_reset: bool = True):
+        assert num_envs >= 1, "num_envs must be >= 1"
+        self.num_envs = int(num_envs)
+        self.auto_reset = bool(auto_reset)
+        self.envs: List[GGEnv] = [
+            GGEnv(frame_skip=frame_skip, time_limit_seconds=time_limit_seconds)
+            for _ in range(self.num_envs)
+        ]
+
+        self.single_observation_space = self.envs[0].observation_space
+        self.single_action_space = self.envs[0].action_space
+
+        obs_dim = int(self.single_observation_space.shape[0])
+        self.obs = np.zeros((self.num_envs, obs_dim), dtype=np.float32)
+        self.rewards = np.zeros(self.num_envs, dtype=np.float32)
+        self.terminated = np.zeros(self.num_envs, dtype=bool)
+        self.truncated = np.zeros(self.num_envs, dtype=bool)
+        self.grounded = np.zeros(self.num_envs, dtype=bool)
+        self.distance_px = np.zeros(self.num_envs, dtype=np.float32)
+        self.seeds = np.zeros(self.num_envs, dtype=np.int64)
+
+        # Stats of the episode that ended when a sub-env auto-reset this step
+        self.final_distance_px = np.zeros(self.num_envs, dtype=np.float32)
+        self.final_timestep = np.zeros(self.num_envs, dtype=np.int64)
+        self.final_death_cause: List[Optional[str]] = [None] * self.num_envs
+
+        self._next_seed = 0  # fallback reseeding stream for auto-reset
+
+    # -------------------- Core API --------------------
+
+    def reset(self, seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Reset every sub-env; `seeds` gives one seed per env (or None for random)."""
+        if seeds is not None:
+            assert len(seeds) == self.num_envs, "need one seed per env"
+        for i, env in enumerate(self.envs):
+            seed = int(seeds[i]) if seeds is not None else None
+            obs, _ = env.reset(seed=seed)
+            self.obs[i] = obs
+            self.seeds[i] = env.current_seed
+        self.rewards[:] = 0.0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        self.grounded[:] = False
+        self.distance_px[:] = 0.0
+        return self.obs
+
+    def step(self, actions: np.ndarray):
+        """
+        Advance all sub-envs with `actions` of shape (N,).
+        Returns (obs, rewards, terminated, truncated) as views on the SoA
+        buffers — copy them if you need them to survive the next step.
+
+        Flip handling stays inside each sub-env's step: try_flip is gated on
+        grounded/contact-buffer/cooldown state owned by Player, so a batched
+        `(actions == 1) & alive` mask can't decide it without forking those
+        semantics into array form.
+        """
+        actions = np.asarray(actions)  # accept lists/tuples once, not per env
+        for i, env in enumerate(self.envs):
+            _, r, term, trunc, _ = env.step(int(actions[i]), out=self.obs[i])
+            self.rewards[i] = r
+            self.terminated[i] = term
+            self.truncated[i] = trunc
+            self.grounded[i] = env.last_grounded
+            self.distance_px[i] = env.distance_px
+
+            if (term or trunc) and self.auto_reset:
+                self.final_distance_px[i] = env.distance_px
+                self.final_timestep[i] = env.timestep
+                self.final_death_cause[i] = env.death_cause
+                self._reset_one(i)
+
+        return self.obs, self.rewards, self.terminated, self.truncated
+
+    def reset_done(self) -> np.ndarray:
+        """Re-initialize any terminated/truncated sub-envs in place (for use
+        with auto_reset=False) and return the indices that were reset."""
+        done_idx = np.flatnonzero(self.terminated | self.truncated)
+        for i in done_idx:
+            self._reset_one(int(i))
+        return done_idx
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    # -------------------- Helpers --------------------
+
+    def _reset_one(self, i: int):
+        env = self.envs[i]
+        obs, _ = env.reset(seed=self._next_seed)
+        self._next_seed += 1
+        self.obs[i] = obs
+        self.seeds[i] = env.current_seed
+        self.distance_px[i] = 0.0
+        self.grounded[i] = False
@@ -44,7 +44,7 @@ from typing import Optional, List, Tuple, Dict
 import pygame
 
 from ..game.config import (
-    WIDTH, HEIGHT, SCROLL_PX_PER_S, PLAYER_X, PLAYER_H
+    WIDTH, HEIGHT, SCROLL_PX_PER_S, PLAYER_X, PLAYER_H, PLAYER_W
 )
 from ..game.level import LevelGen
 from ..game.player import Player
@@ -119,14 +119,16 @@ class GGEnv:
         self.player = player
         self.time_s = 0.0
         self.distance_px = 0.0
-        self.current_level_seed = getattr(level, "seed", seed_spec)
+        # LevelGen always freezes its effective seed — no getattr fallback
+        self.current_level_seed = level.seed
 
-        # One collision settle so 'grounded' is consistent if we spawn on a platform
-        plat_rects = [p.rect for p in self.level.platforms]
-        prev_y = self.player.y
-        # Keep the same order we found stable in-game:
-        self.player.resolve_collisions_swept(prev_y, plat_rects)
+        # One collision settle so 'grounded' is consistent if we spawn on a
+        # platform. The SoA resolver also fixes the old settle call, which
+        # handed a Rect list to resolve_collisions_swept and died on
+        # plat.rect inside the Platform-object sweep.
+        self.player.resolve_collisions_soa(self.level)
 
+        plat_rects = self.level.rects  # cached list, rebuilt only on set changes
         obs = build_observation(self.player, plat_rects)
         return obs
     
@@ -149,24 +151,34 @@ class GGEnv:
         prev_y = self.player.y
         self.player.update_physics(self.dt)
 
-        # --- resolve collisions with Platform objects (not just rects)
-        grounded, collision_occurred = self.player.resolve_collisions_with_platforms(self.level.platforms)
+        # --- resolve collisions with Platform objects (not just rects).
+        # SoA resolver: binary-searches the sorted platform bounds for the
+        # few candidates under the player instead of scanning the whole list
+        # (see Player.resolve_collisions_soa — same resolution, same order).
+        grounded, collision_occurred = self.player.resolve_collisions_soa(self.level)
 
-        # --- reward: progress minus penalty only if the flip actually happened
+        # --- reward: progress minus penalty only if the flip actually happened.
+        # Branchless on purpose: did_flip is effectively a coin flip, so the
+        # multiply beats a data-dependent branch and vectorizes as a masked
+        # subtract if this ever runs batched.
         step_progress = self.dt * SCROLL_PX_PER_S
-        reward = step_progress - (self.flip_penalty if did_flip else 0.0)
+        reward = step_progress - self.flip_penalty * int(did_flip)
 
         # --- episode bookkeeping
         self.time_s += self.dt
         self.distance_px += step_progress
         out_of_bounds = (self.player.y < -80) or (self.player.y > HEIGHT + 80)
+        # Horizontal exits for the info dict (were referenced but never
+        # assigned, so every step died on a NameError)
+        off_screen_left = self.player.x < -PLAYER_W
+        off_screen_right = self.player.x > WIDTH + PLAYER_W
         if out_of_bounds:
             reward -= 20.0  # extra penalty for going off-screen
         time_up = self.time_s >= self.max_time_s
         done = bool(out_of_bounds or time_up)
 
         # --- observation (use platform rects for observation system)
-        plat_rects = [p.rect for p in self.level.platforms]
+        plat_rects = self.level.rects  # cached list, rebuilt only on set changes
         obs = build_observation(self.player, plat_rects)
 
         info = {
@@ -176,7 +188,7 @@ class GGEnv:
             "out_of_bounds": out_of_bounds,
             "time_up": time_up,
             "grounded": bool(self.player.grounded),
-            "cooldown": max(0.0, float(getattr(self.player, "_flip_cooldown", 0.0))),
+            "cooldown": max(0.0, float(self.player._flip_cooldown)),
             "grav_dir": int(self.player.grav_dir),
             "did_flip": bool(did_flip),
             "probes": obs[3:6],
@@ -4,7 +4,7 @@
     Returns:
         _type_: _description_
 """
-    
+
 from __future__ import annotations
 from typing import List
 import pygame
@@ -12,78 +12,118 @@ from ..game.config import (HEIGHT, WIDTH, PLAYER_H, PLAYER_W, MAX_VY)
 
 PROBE_OFFSETS = (120, 240, 360)  # Horizontal lookahead offsets (in pixels)
 MAX_CLEARANCE = HEIGHT  # Maximum clearance for normalization
-DEBUG_PROBES = False  # Set to True for detailed debugging
+
+# Reciprocals hoisted to module load: multiply instead of divide per value
+INV_MAX_CLEARANCE = 1.0 / MAX_CLEARANCE
+INV_Y_DENOM = 1.0 / max(1.0, HEIGHT - PLAYER_H)
+INV_MAX_VY = 1.0 / MAX_VY
 
 def build_observation(player, platforms: List[pygame.Rect]) -> list:
     """
     Build a compact observation vector for the agent.
-    
+
     FIXED: Now properly calculates different clearances for each probe distance
-    
+
     Returns: [y_norm, vy_norm, grav_dir, probe120, probe240, probe360]
     where probe values represent CLEARANCE (0=collision, 1=max safe distance)
+
+    Hot path: no debug branches here — use build_observation_verbose /
+    debug_probe_calculation when you need the step-by-step breakdown.
     """
     # Normalize player position and velocity
-    y_norm = max(0.0, min(1.0, player.y / max(1.0, HEIGHT - PLAYER_H)))
-    vy_norm = max(-1.0, min(1.0, player.vy / MAX_VY))
+    y_norm = max(0.0, min(1.0, player.y * INV_Y_DENOM))
+    vy_norm = max(-1.0, min(1.0, player.vy * INV_MAX_VY))
+    g = 1.0 if player.grav_dir > 0 else -1.0
+
+    # Player bounds — plain ints, same truncation as the old pygame.Rect
+    # (no C Rect allocation just to read centerx/top/bottom)
+    top = int(player.y)
+    bottom = top + PLAYER_H
+    cx = int(player.x) + PLAYER_W // 2
+
+    # Probe layout is a module constant, so the 3-probe inner loop is
+    # unrolled by hand: scalar mins, no FOR_ITER/indexing per platform.
+    px0 = cx + PROBE_OFFSETS[0]
+    px1 = cx + PROBE_OFFSETS[1]
+    px2 = cx + PROBE_OFFSETS[2]
+    mc0 = mc1 = mc2 = None
+
+    # One pass over the platforms feeding every probe: each platform's
+    # attributes are read once instead of once per probe offset.
+    # LevelGen appends left-to-right and culls from the front, so the list is
+    # x-sorted: skip platforms ending before the first probe, stop at the
+    # first one starting past the last.
+    for pr in platforms:
+        l, r, pt, pb = pr.left, pr.right, pr.top, pr.bottom
+        if r < px0:
+            continue
+        if l > px2:
+            break
+        if g > 0:  # Gravity pulls down - look for platforms below
+            if pt < bottom:  # Platform not below player bottom
+                continue
+            clearance = pt - bottom
+        else:      # Gravity pulls up - look for platforms above
+            if pb > top:     # Platform not above player top
+                continue
+            clearance = top - pb
+        # Use <= and >= to be more inclusive
+        if l <= px0 <= r and (mc0 is None or clearance < mc0):
+            mc0 = clearance
+        if l <= px1 <= r and (mc1 is None or clearance < mc1):
+            mc1 = clearance
+        if l <= px2 <= r and (mc2 is None or clearance < mc2):
+            mc2 = clearance
+
+    # Convert to normalized clearance (0=collision, 1=max safe);
+    # no obstacle = maximum clearance
+    probes = [1.0 if mc is None else max(0.0, min(1.0, mc * INV_MAX_CLEARANCE))
+              for mc in (mc0, mc1, mc2)]
+
+    return [y_norm, vy_norm, g] + probes
+
+
+def build_observation_verbose(player, platforms: List[pygame.Rect]) -> list:
+    """
+    Slow-path twin of build_observation: same result, plus a printed
+    breakdown of every probe/platform comparison. Lives outside the hot
+    function so the debug printing costs nothing when not in use.
+    """
+    top = int(player.y)
+    bottom = top + PLAYER_H
+    cx = int(player.x) + PLAYER_W // 2
     g = 1.0 if player.grav_dir > 0 else -1.0
 
-    # Player bounds
-    me = pygame.Rect(player.x, player.y, PLAYER_W, PLAYER_H)
-    cx, top, bottom = me.centerx, me.top, me.bottom
-    
-    probes: List[float] = []
-    
-    if DEBUG_PROBES:
-        print(f"\n=== PROBE DEBUG ===")
-        print(f"Player at ({cx}, {player.y}), gravity={g:+.0f}")
-        print(f"Player bounds: top={top}, bottom={bottom}")
-    
-    # For each lookahead distance, find nearest obstacle
+    print(f"\n=== PROBE DEBUG ===")
+    print(f"Player at ({cx}, {player.y}), gravity={g:+.0f}")
+    print(f"Player bounds: top={top}, bottom={bottom}")
+
     for i, dx in enumerate(PROBE_OFFSETS):
         probe_x = cx + dx
         min_clearance = None
-        
-        if DEBUG_PROBES:
-            print(f"\nProbe {i+1} at x={probe_x}:")
-        
-        # Check all platforms for potential collisions at this x-coordinate
+        print(f"\nProbe {i+1} at x={probe_x}:")
         for pi, pr in enumerate(platforms):
-            # Check if this platform intersects our probe line
-            # Use <= and >= to be more inclusive
             if pr.left <= probe_x <= pr.right:
-                if g > 0:  # Gravity pulls down - look for platforms below
-                    if pr.top >= bottom:  # Platform is below player bottom
+                if g > 0:
+                    if pr.top >= bottom:
                         clearance = pr.top - bottom
-                        if DEBUG_PROBES:
-                            print(f"  Platform {pi}: top={pr.top}, clearance={clearance:.1f}")
+                        print(f"  Platform {pi}: top={pr.top}, clearance={clearance:.1f}")
                         if clearance >= 0 and (min_clearance is None or clearance < min_clearance):
                             min_clearance = clearance
-                else:  # Gravity pulls up - look for platforms above
-                    if pr.bottom <= top:  # Platform is above player top
+                else:
+                    if pr.bottom <= top:
                         clearance = top - pr.bottom
-                        if DEBUG_PROBES:
-                            print(f"  Platform {pi}: bottom={pr.bottom}, clearance={clearance:.1f}")
+                        print(f"  Platform {pi}: bottom={pr.bottom}, clearance={clearance:.1f}")
                         if clearance >= 0 and (min_clearance is None or clearance < min_clearance):
                             min_clearance = clearance
-        
-        # Convert to normalized clearance (0=collision, 1=max safe)
         if min_clearance is None:
-            normalized_clearance = 1.0  # No obstacle = maximum clearance
-            if DEBUG_PROBES:
-                print(f"  No obstacle found -> clearance = 1.0")
+            print(f"  No obstacle found -> clearance = 1.0")
         else:
-            normalized_clearance = max(0.0, min(1.0, min_clearance / MAX_CLEARANCE))
-            if DEBUG_PROBES:
-                print(f"  Min clearance = {min_clearance:.1f} -> normalized = {normalized_clearance:.3f}")
-        
-        probes.append(normalized_clearance)
-    
-    observation = [y_norm, vy_norm, g] + probes
-    
-    if DEBUG_PROBES:
-        print(f"Final observation: {observation}")
-    
+            normalized = max(0.0, min(1.0, min_clearance / MAX_CLEARANCE))
+            print(f"  Min clearance = {min_clearance:.1f} -> normalized = {normalized:.3f}")
+
+    observation = build_observation(player, platforms)
+    print(f"Final observation: {observation}")
     return observation
 
 
@@ -91,15 +131,9 @@ def debug_probe_calculation(player, platforms: List[pygame.Rect]):
     """
     Standalone function to debug probe calculation issues
     """
-    global DEBUG_PROBES
-    DEBUG_PROBES = True
-    
     print("=== DETAILED PROBE DEBUG ===")
     print(f"Total platforms: {len(platforms)}")
     for i, p in enumerate(platforms):
         print(f"Platform {i}: left={p.left}, right={p.right}, top={p.top}, bottom={p.bottom}")
-    
-    obs = build_observation(player, platforms)
-    
-    DEBUG_PROBES = False
-    return obs
\ No newline at end of file
+
+    return build_observation_verbose(player, platforms)
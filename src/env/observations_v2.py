@@ -7,6 +7,7 @@ import pygame
 from src.game.config import (
     WIDTH, HEIGHT, PLAYER_X, PLAYER_H, MAX_VY, SPIKE_BASE
 )
+from src.env._obs_kernel import HAS_NUMBA, probe_kernel
 
 # Probe positions ahead of the player (world space)
 PROBE_OFFSETS_V2: Tuple[int, int, int] = (120, 240, 360)
@@ -16,10 +17,16 @@ SPIKE_WINDOW_PX: int = max(16, SPIKE_BASE // 2)
 def _clamp01(x: float) -> float:
     return 0.0 if x < 0.0 else (1.0 if x > 1.0 else x)
 
+# Normalizer denominator for the player's top coordinate (constant per build)
+_Y_TOP_DENOM = max(1, HEIGHT - PLAYER_H)
+
+# Probe world-x positions for the default offsets, built once at module load
+# (the player anchor never moves horizontally).
+_PROBE_XS_DEFAULT = np.asarray(PROBE_OFFSETS_V2, dtype=np.int32) + int(PLAYER_X)
+
 def _norm_top_y(y_top: float) -> float:
     """Normalize a top coordinate into [0,1] using [0, HEIGHT-PLAYER_H]."""
-    denom = max(1, HEIGHT - PLAYER_H)
-    return _clamp01(y_top / denom)
+    return _clamp01(y_top / _Y_TOP_DENOM)
 
 def _norm_vy(vy: float, vy_max: float = MAX_VY) -> float:
     """Clip vy to [-vy_max, vy_max] and scale to [-1,1]."""
@@ -61,6 +68,11 @@ def _spike_presence_near_x(
     Detects spike presence near x (±window_px) by lane.
     Returns (has_top, has_bot) as 0/1.
     Accepts Spike objects with .platform/.local_x/.lane or dict/tuple equivalents.
+
+    Reference implementation only: the hot path reads LevelGen's
+    spike_tri/spike_is_top SoA arrays (kernel or broadcast mask) instead of
+    iterating Spike objects — this loop backs build_observation_v2 for the
+    overlay/tests and tolerates loose spike formats.
     """
     if not spikes:
         return 0, 0
@@ -102,6 +114,121 @@ def _spike_presence_near_x(
 
     return has_top, has_bot
 
+def build_observation_v2_soa(
+    player,
+    level,
+    probe_offsets: Tuple[int, int, int] = PROBE_OFFSETS_V2,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fast-path twin of `build_observation_v2` that reads LevelGen's SoA arrays
+    (plat_left/right/top/bottom, spike_tri/spike_is_top) instead of a list of
+    pygame.Rect — no per-call Rect materialization or attribute walking.
+    Produces the identical (15,) float32 vector.
+
+    With `out` given, the features are written into that float32 buffer and no
+    array is allocated (callers reusing a buffer must copy if they need the
+    previous step's observation to survive).
+    """
+    obs = out if out is not None else np.empty(3 + 4 * len(probe_offsets), dtype=np.float32)
+
+    p_left = level.plat_left
+    p_right = level.plat_right
+    p_top = level.plat_top
+    p_bottom = level.plat_bottom
+    # Same lane rule as _surfaces_at_x: classify by rect centery vs mid-screen
+    # (a moving "top" platform can dip past the middle).
+    p_centery = (p_top + p_bottom) // 2
+    p_is_upper = p_centery < HEIGHT * 0.5
+
+    spike_cx = level.spike_tri[:, 2, 0]  # apex x == spike center x
+    spike_is_top = level.spike_is_top
+
+    # All probes at once: (platforms, probes) coverage masks instead of a
+    # Python loop per probe.
+    if probe_offsets is PROBE_OFFSETS_V2:
+        xs = _PROBE_XS_DEFAULT
+    else:
+        xs = np.asarray(probe_offsets, dtype=np.int32) + int(PLAYER_X)
+
+    if HAS_NUMBA:
+        # Single typed pass over the SoA columns (see _obs_kernel) for the
+        # whole vector, scalar head included — all clamps run branchless in
+        # compiled code. The NumPy path below is the equivalent fallback
+        # without numba. p_left is x-sorted, so searchsorted bounds the
+        # covering run per probe.
+        cover_hi = np.searchsorted(p_left, xs, side="right")
+        probe_kernel(float(player.y), float(player.vy),
+                     float(player.grav_dir),
+                     float(_Y_TOP_DENOM), float(MAX_VY),
+                     p_left, p_top, p_right, p_bottom, p_is_upper,
+                     spike_cx, spike_is_top, xs, cover_hi,
+                     SPIKE_WINDOW_PX, HEIGHT, obs)
+        return obs
+
+    obs[0] = _norm_top_y(float(player.y))
+    obs[1] = _norm_vy(float(player.vy))
+    obs[2] = +1.0 if player.grav_dir > 0 else -1.0
+
+    # Same sorted-x window the kernel uses: only platforms whose span can
+    # reach a probe enter the broadcast (p_left and p_right are both
+    # non-decreasing, so candidates form one contiguous run).
+    lo = np.searchsorted(p_right, int(xs.min()), side="right")
+    hi = np.searchsorted(p_left, int(xs.max()), side="right")
+    p_left = p_left[lo:hi]
+    p_right = p_right[lo:hi]
+    p_top = p_top[lo:hi]
+    p_bottom = p_bottom[lo:hi]
+    p_is_upper = p_is_upper[lo:hi]
+
+    if p_left.shape[0]:
+        covered = (p_left[:, None] <= xs) & (xs < p_right[:, None])
+        upper = covered & p_is_upper[:, None]
+        lower = covered & ~p_is_upper[:, None]
+
+        # min bottom of covering upper platforms (ceiling), max top of
+        # covering lower platforms (floor); sentinels where none cover.
+        ceil_y = np.where(upper, p_bottom[:, None], np.int32(2 * HEIGHT)).min(axis=0)
+        floor_y = np.where(lower, p_top[:, None], np.int32(-HEIGHT)).max(axis=0)
+        obs[3::4] = np.where(upper.any(axis=0),
+                             np.clip(ceil_y / float(HEIGHT), 0.0, 1.0), 0.0)
+        obs[4::4] = np.where(lower.any(axis=0),
+                             np.clip(floor_y / float(HEIGHT), 0.0, 1.0), 1.0)
+    else:
+        obs[3::4] = 0.0   # "no ceiling" sentinel
+        obs[4::4] = 1.0   # "no floor" sentinel
+
+    near = np.abs(spike_cx[:, None] - xs) <= SPIKE_WINDOW_PX
+    obs[5::4] = (near & spike_is_top[:, None]).any(axis=0)
+    obs[6::4] = (near & ~spike_is_top[:, None]).any(axis=0)
+
+    return obs
+
+def quantize_obs_int8(obs: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Pack an obs-v2 vector (or (N, 15) batch) into int8 for compact transport.
+
+    Every channel is bounded in [-1, 1] (the [0,1] features included), so one
+    symmetric scale of 127 covers all of them and the agent side un-quantizes
+    with a single fused multiply — no per-channel offsets. Worst-case
+    round-trip error is 1/254 per feature, far below what the policy can use.
+    Intended for fan-out transports (shared-memory vec envs, replay storage);
+    GGEnv itself keeps the float32 Box contract.
+    """
+    q = np.multiply(obs, 127.0, out=None)
+    np.rint(q, out=q)
+    if out is None:
+        return q.astype(np.int8)
+    np.copyto(out, q, casting="unsafe")
+    return out
+
+def dequantize_obs_int8(q: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Inverse of `quantize_obs_int8`: int8 back to float32 features."""
+    if out is None:
+        return q.astype(np.float32) * np.float32(1.0 / 127.0)
+    np.multiply(q.astype(np.float32), np.float32(1.0 / 127.0), out=out)
+    return out
+
 def build_observation_v2(
     player,
     platform_rects: List[pygame.Rect],
@@ -124,7 +251,7 @@ def build_observation_v2(
     # Top-based player.y (we assume you've standardized this)
     y_top_norm = np.float32(_norm_top_y(float(player.y)))
     vy_norm = np.float32(_norm_vy(float(player.vy)))
-    grav = np.float32(+1.0 if getattr(player, "grav_dir", 1) > 0 else -1.0)
+    grav = np.float32(+1.0 if player.grav_dir > 0 else -1.0)
 
     # Build probes from the fixed player anchor
     base_x = int(PLAYER_X)
@@ -0,0 +1,177 @@
+# src/env/subproc_vec_env.py
+"""
+Process-parallel GGEnv batch with shared-memory transport.
+
+SubprocGGVecEnv mirrors GGVecEnv's API (reset/step/close over SoA arrays) but
+runs each sub-env in its own process, so rollout collection scales across
+cores. Observations, actions, rewards and done flags live in one
+multiprocessing SharedMemory block that master and workers map as NumPy
+views: a step exchanges only tiny control tokens over each worker's pipe,
+never pickled arrays — each worker writes its observation row in place via
+GGEnv.step(out=...).
+
+Like GGVecEnv, a sub-env that finishes is auto-reset in place and the ended
+episode's stats come back through final_distance_px / final_timestep (their
+rows are only meaningful on steps where terminated/truncated was set).
+
+Use GGVecEnv when the policy is cheap and N is small (no process overhead);
+use this when env stepping itself is the bottleneck.
+"""
+from __future__ import annotations
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def _carve(buf, num_envs: int, obs_dim: int):
+    """Map the flat shared buffer into the per-field NumPy views.
+
+    Layout (in order): obs (N, obs_dim) f4 | rewards (N,) f4 |
+    final_distance_px (N,) f4 | actions (N,) i1 | terminated (N,) b1 |
+    truncated (N,) b1 | final_timestep (N,) i8.
+    """
+    off = 0
+
+    def view(shape, dtype):
+        nonlocal off
+        a = np.ndarray(shape, dtype=dtype, buffer=buf, offset=off)
+        off += a.nbytes
+        return a
+
+    obs = view((num_envs, obs_dim), np.float32)
+    rewards = view((num_envs,), np.float32)
+    final_distance = view((num_envs,), np.float32)
+    actions = view((num_envs,), np.int8)
+    terminated = view((num_envs,), np.bool_)
+    truncated = view((num_envs,), np.bool_)
+    final_timestep = view((num_envs,), np.int64)
+    return obs, rewards, final_distance, actions, terminated, truncated, final_timestep
+
+
+def _shm_size(num_envs: int, obs_dim: int) -> int:
+    return num_envs * (obs_dim * 4 + 4 + 4 + 1 + 1 + 1 + 8)
+
+
+def _worker(shm_name: str, index: int, num_envs: int, obs_dim: int,
+            frame_skip: int, time_limit_seconds: Optional[float],
+            auto_reset: bool, conn: Connection):
+    # Import here so the master's pygame/display state is never inherited
+    from src.env.gg_env_v2 import GGEnv
+
+    shm = SharedMemory(name=shm_name)
+    (obs, rewards, final_distance, actions,
+     terminated, truncated, final_timestep) = _carve(shm.buf, num_envs, obs_dim)
+
+    env = GGEnv(frame_skip=frame_skip, time_limit_seconds=time_limit_seconds)
+    i = index
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                o, _ = env.reset(seed=arg)
+                obs[i] = o
+                rewards[i] = 0.0
+                terminated[i] = False
+                truncated[i] = False
+                conn.send(env.current_seed)
+            elif cmd == "step":
+                _, r, term, trunc, _ = env.step(int(actions[i]), out=obs[i])
+                rewards[i] = r
+                terminated[i] = term
+                truncated[i] = trunc
+                if (term or trunc) and auto_reset:
+                    final_distance[i] = env.distance_px
+                    final_timestep[i] = env.timestep
+                    o, _ = env.reset(seed=arg)
+                    obs[i] = o
+                conn.send(None)
+            elif cmd == "close":
+                break
+    finally:
+        env.close()
+        shm.close()
+        conn.close()
+
+
+class SubprocGGVecEnv:
+    def __init__(self,
+                 num_envs: int,
+                 frame_skip: int = 4,
+                 time_limit_seconds: Optional[float] = 30.0,
+                 auto_reset: bool = True):
+        assert num_envs >= 1, "num_envs must be >= 1"
+        self.num_envs = int(num_envs)
+        self.auto_reset = bool(auto_reset)
+
+        # Spaces without instantiating a full env (worlds live in the workers)
+        from src.env.gg_env_v2 import GGEnv
+        probe = GGEnv(frame_skip=frame_skip, time_limit_seconds=time_limit_seconds)
+        self.single_observation_space = probe.observation_space
+        self.single_action_space = probe.action_space
+        probe.close()
+        obs_dim = int(self.single_observation_space.shape[0])
+
+        self._shm = SharedMemory(create=True, size=_shm_size(self.num_envs, obs_dim))
+        (self.obs, self.rewards, self.final_distance_px, self._actions,
+         self.terminated, self.truncated, self.final_timestep) = \
+            _carve(self._shm.buf, self.num_envs, obs_dim)
+
+        self._next_seed = 0  # fallback reseeding stream for auto-reset
+        self._conns: List[Connection] = []
+        self._procs: List[mp.Process] = []
+        for i in range(self.num_envs):
+            parent, child = mp.Pipe()
+            p = mp.Process(
+                target=_worker,
+                args=(self._shm.name, i, self.num_envs, obs_dim,
+                      frame_skip, time_limit_seconds, auto_reset, child),
+                daemon=True,
+            )
+            p.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(p)
+
+        self.seeds = np.zeros(self.num_envs, dtype=np.int64)
+
+    # -------------------- Core API --------------------
+
+    def reset(self, seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Reset every sub-env; `seeds` gives one seed per env (or None for random)."""
+        if seeds is not None:
+            assert len(seeds) == self.num_envs, "need one seed per env"
+        for i, conn in enumerate(self._conns):
+            conn.send(("reset", int(seeds[i]) if seeds is not None else None))
+        for i, conn in enumerate(self._conns):
+            self.seeds[i] = conn.recv()
+        return self.obs
+
+    def step(self, actions: np.ndarray):
+        """
+        Advance all sub-envs with `actions` of shape (N,).
+        Returns (obs, rewards, terminated, truncated) as views on the shared
+        buffers — copy them if you need them to survive the next step.
+        """
+        np.copyto(self._actions, np.asarray(actions, dtype=np.int8))
+        for conn in self._conns:
+            # Auto-reset seed rides along so the worker never blocks mid-step
+            conn.send(("step", self._next_seed))
+            self._next_seed += 1
+        for conn in self._conns:
+            conn.recv()
+        return self.obs, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=5)
+        self._shm.close()
+        self._shm.unlink()
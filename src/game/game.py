@@ -1,5 +1,5 @@
 # src/game/game.py
-import sys, argparse, random
+import sys, os, argparse, random
 import pygame
 from pygame import K_SPACE, K_ESCAPE, K_r, K_n
 from .config import (
@@ -10,9 +10,7 @@ from .config import (
 )
 from .level import LevelGen
 from .player import Player
-from src.env.observations import build_observation
-from .level import rect_intersects_triangle_strict
-from src.env.observations_v2 import build_observation_v2
+from src.env.observations_v2 import build_observation_v2_soa
 
 TEST_OBSERVATIONS_LOGS = False
 
@@ -20,6 +18,10 @@ def parse_args():
     p = argparse.ArgumentParser()
     p.add_argument("--seed", type=int, default=None,
                    help="Level seed. Omit for SEED_DEFAULT, use -1 for random each launch.")
+    p.add_argument("--headless", action="store_true",
+                   help="No window, no rendering, no FPS cap: step the sim at "
+                        "fixed dt until death and print the run summary. "
+                        "For throughput checks of the simulation itself.")
     return p.parse_args()
 
 def run():
@@ -36,11 +38,23 @@ def run():
     # Test observations
     _print_timer = 0.0 if TEST_OBSERVATIONS_LOGS else None
 
+    # Headless: swap in SDL's dummy video driver before init so no window is
+    # created; the render block below is skipped entirely and the clock runs
+    # uncapped — the whole frame budget goes to simulation.
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
     pygame.init()
     pygame.display.set_caption("Gravity Guy — playable baseline")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     clock = pygame.time.Clock()
 
+    # Only the event types the loop dispatches on are allowed to queue; SDL
+    # drops the rest (MOUSEMOTION alone can fire hundreds of times a second)
+    # in C instead of handing them to the Python loop to ignore.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN])
+
     def reset_world(seed_spec):
         level = LevelGen(seed_spec)      # seed_spec: int or None
         player = Player(x=float(PLAYER_X), y=HEIGHT/2 - PLAYER_H/2, vy=0.0, grav_dir=1, grounded=False)
@@ -52,13 +66,36 @@ def run():
     level, player, distance_px, alive, current_seed = reset_world(launch_seed)
     font = pygame.font.SysFont("jetbrainsmono", 18)
 
+    # Static text never changes: rasterize once, blit forever. The HUD line
+    # only changes when its displayed values do (~once per px of distance),
+    # so it re-renders on key change instead of every frame.
+    legend_surf = font.render("SPACE flip | ESC quit", True, (160, 180, 210))
+    hud_key = None
+    hud_surf = None
+    btn_txt = font.render("Restart (R)", True, (220, 235, 255))
+    btn_txt2 = font.render("New Random (N)", True, (220, 235, 255))
+
     btn_w, btn_h = 180, 70  # Increased height to fit both messages
     restart_rect = pygame.Rect((WIDTH - btn_w)//2, (HEIGHT - btn_h)//2, btn_w, btn_h)
 
+    # Fixed-timestep simulation ("fix your timestep"): real frame time feeds
+    # an accumulator and physics always advances in FIXED_DT quanta, so a slow
+    # or stalled render never changes the simulation — same rate the env uses.
+    # The leftover fraction interpolates the player's drawn position.
+    FIXED_DT = 1.0 / FPS
+    accumulator = 0.0
+    prev_y = player.y
+
     while True:
-        dt = clock.tick(FPS) / 1000.0
-        if dt > 1.0 / 30.0:  # clamp stalls
-            dt = 1.0 / 30.0
+        if args.headless:
+            # Deterministic stepping: exactly one physics step per loop turn,
+            # as fast as the machine allows.
+            clock.tick(0)
+            frame_dt = FIXED_DT
+        else:
+            frame_dt = clock.tick(FPS) / 1000.0
+            if frame_dt > 0.25:  # clamp huge stalls (debugger, window drag)
+                frame_dt = 0.25
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -71,72 +108,103 @@ def run():
                 if event.key == K_r and not alive:
                     # Restart SAME seed
                     level, player, distance_px, alive, current_seed = reset_world(current_seed)
+                    accumulator, prev_y = 0.0, player.y
                 if event.key == K_n and not alive:
                     # Restart with NEW RANDOM seed (even if still alive)
                     level, player, distance_px, alive, current_seed = reset_world(None)
+                    accumulator, prev_y = 0.0, player.y
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and (not alive):
                 if restart_rect.collidepoint(event.pos):
                     level, player, distance_px, alive, current_seed = reset_world(current_seed)
+                    accumulator, prev_y = 0.0, player.y
 
         # player_rect = pygame.Rect(PLAYER_X - PLAYER_W//2, int(player.y) - PLAYER_H//2, PLAYER_W, PLAYER_H)
 
         if alive:
-            level.update_and_generate(dt)
-            prev_y = player.y
-            player.update_physics(dt)
-            grounded, collision_occurred = player.resolve_collisions_with_platforms(level.platforms)
-
-            player_rect = pygame.Rect(
-                PLAYER_X - PLAYER_W // 2,
-                int(player.y),
-                PLAYER_W,
-                PLAYER_H
-            )
-
-            distance_px += dt * SCROLL_PX_PER_S
-
-            # Test observations (if enabled)
-            if _print_timer is not None:
-                _print_timer -= dt
-                if _print_timer <= 0.0:
-                    _print_timer = 0.5  # print twice per second
-                    plat_rects = [p.rect for p in level.platforms]
-                    obs = build_observation(player, plat_rects)
-                    # Add collision debug info
-                    moving_platforms = sum(1 for p in level.platforms if p.platform_type == "moving")
-                    print(f"OBS y={obs[0]:.2f} vy={obs[1]:.2f} g={obs[2]:+.0f} p120={obs[3]:.2f} p240={obs[4]:.2f} p360={obs[5]:.2f} | grounded={player.grounded} | moving_plats={moving_platforms}")
-            
-            
-            for sp in level.spikes:
-                tri = sp.world_points()     # <-- sans paramètre
-                aabb = sp.aabb()            # <-- sans paramètre
-                if aabb.colliderect(player_rect):
-                    if rect_intersects_triangle_strict(player_rect, tri):
-                        alive = False
-                        break
-            
-            # Check for out-of-bounds death
-            out_of_bounds = (player.y < -80) or (player.y > HEIGHT + 80)
-            if out_of_bounds:
-                alive = False
+            accumulator += frame_dt
+            while accumulator >= FIXED_DT and alive:
+                accumulator -= FIXED_DT
+                level.update_and_generate(FIXED_DT)
+                prev_y = player.y
+                player.update_physics(FIXED_DT)
+                # Collision sweep on the SoA bounds: windowed by binary search
+                # and compiled (see Player.resolve_collisions_soa).
+                grounded, collision_occurred = player.resolve_collisions_soa(level)
+
+                player_rect = pygame.Rect(
+                    PLAYER_X - PLAYER_W // 2,
+                    int(player.y),
+                    PLAYER_W,
+                    PLAYER_H
+                )
+
+                distance_px += FIXED_DT * SCROLL_PX_PER_S
+
+                # Test observations (if enabled)
+                if _print_timer is not None:
+                    _print_timer -= FIXED_DT
+                    if _print_timer <= 0.0:
+                        _print_timer = 0.5  # print twice per second
+                        # SoA builder reads LevelGen's cached arrays — no rect
+                        # list rebuild per print
+                        obs = build_observation_v2_soa(player, level)
+                        # Add collision debug info
+                        moving_platforms = sum(1 for p in level.platforms if p.platform_type == "moving")
+                        print(f"OBS y={obs[0]:.2f} vy={obs[1]:.2f} g={obs[2]:+.0f} ceil120={obs[3]:.2f} floor120={obs[4]:.2f} | grounded={player.grounded} | moving_plats={moving_platforms}")
+
+                # Spike death test: compiled SoA pass (AABB prefilter inline)
+                # when numba is present, candidate scan otherwise.
+                if level.any_spike_hit(player_rect):
+                    alive = False
+
+                # Check for out-of-bounds death
+                out_of_bounds = (player.y < -80) or (player.y > HEIGHT + 80)
+                if out_of_bounds:
+                    alive = False
+        else:
+            accumulator = 0.0
+
+        # Headless runs never draw; there's no restart UI either, so the run
+        # ends at the first death with a reproducible summary line.
+        if args.headless:
+            if not alive:
+                print(f"[headless] seed={current_seed} distance_px={int(distance_px)}")
+                pygame.quit()
+                return
+            continue
 
         # --- Render ---
         screen.fill(COLOR_BG)
         level.draw(screen, COLOR_PLAT)
         color_player = COLOR_ACCENT if alive else COLOR_DANGER
-        pygame.draw.rect(screen, color_player, player.rect)
+        if alive:
+            # Interpolate the drawn y across the leftover sub-frame time so
+            # render rate and physics rate stay visually decoupled.
+            alpha = accumulator / FIXED_DT
+            draw_y = prev_y + (player.y - prev_y) * alpha
+        else:
+            draw_y = player.y
+        # fill() hits SDL_FillRect directly — cheaper than the draw-primitive
+        # path for a solid axis-aligned rect.
+        screen.fill(color_player,
+                    pygame.Rect(int(player.x), int(draw_y), PLAYER_W, PLAYER_H))
 
         # HUD shows seed so you can reproduce runs
-        g_txt = "↓" if player.grav_dir > 0 else "↑"
-        hud = f"Seed: {current_seed}   Dist: {int(distance_px)} px   Grav: {g_txt}   {'ALIVE' if alive else 'DEAD'}"
-        screen.blit(font.render(hud, True, COLOR_FG), (12, 10))
-        screen.blit(font.render("SPACE flip | ESC quit", True, (160, 180, 210)), (12, 32))
+        key = (current_seed, int(distance_px), player.grav_dir, alive)
+        if key != hud_key:
+            g_txt = "↓" if player.grav_dir > 0 else "↑"
+            hud = f"Seed: {current_seed}   Dist: {int(distance_px)} px   Grav: {g_txt}   {'ALIVE' if alive else 'DEAD'}"
+            hud_surf = font.render(hud, True, COLOR_FG)
+            hud_key = key
+        screen.blit(hud_surf, (12, 10))
+        screen.blit(legend_surf, (12, 32))
 
         # ---- Debug Observation v2 Overlay (top-left) ----
         if DEBUG_OBS_OVERLAY:
-            # Build the observation using rects + spikes
-            plat_rects = [p.rect for p in level.platforms]
-            obs = build_observation_v2(player, plat_rects, level.spikes)
+            # Build the observation from LevelGen's SoA arrays (same values as
+            # the rect-list builder, without re-materializing the list each
+            # frame)
+            obs = build_observation_v2_soa(player, level)
 
             # Draw vertical probe lines at the probe x-positions
             for dx in OBS_PROBE_OFFSETS:
@@ -171,16 +239,18 @@ def run():
             pygame.draw.rect(screen, (40, 60, 90), restart_rect, border_radius=10)
             pygame.draw.rect(screen, (90, 130, 180), restart_rect, width=2, border_radius=10)
             
-            # First button text (Restart)
-            btn_txt = font.render("Restart (R)", True, (220, 235, 255))
+            # Button labels are pre-rendered once before the loop
             screen.blit(btn_txt, (restart_rect.centerx - btn_txt.get_width()//2,
                                   restart_rect.centery - btn_txt.get_height() - 5))  # Moved up
-            
-            # Second button text (New Random)
-            btn_txt2 = font.render("New Random (N)", True, (220, 235, 255))
+
             screen.blit(btn_txt2, (restart_rect.centerx - btn_txt2.get_width()//2,
                                    restart_rect.centery + 5))  # Moved down
 
+        # Presentation stays on the main thread on purpose: SDL only supports
+        # video calls (flip included) from the thread that created the window,
+        # so handing flip to a worker to overlap the vsync wait with next-frame
+        # physics is undefined behaviour (hard crash on macOS). The fixed
+        # timestep above already keeps the simulation immune to vsync stalls.
         pygame.display.flip()
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ import random
 import math
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
+import numpy as np
 import pygame
 from .config import (
     WIDTH, HEIGHT, PLATFORM_THICKNESS, LANE_TOP_Y, LANE_BOT_Y,
@@ -13,6 +14,8 @@ from .config import (
     SPIKE_CHANCE, SPIKE_MIN_PER_PLATFORM, SPIKE_MAX_PER_PLATFORM,
     SPIKE_HEIGHT, SPIKE_BASE, SPIKE_MARGIN_X, SPIKE_MIN_SPACING, COLOR_SPIKE, SPIKE_MIN_SPACING, SPIKE_MARGIN_X
 )
+from src.env._spike_kernel import HAS_NUMBA as HAS_SPIKE_KERNEL, any_spike_hits
+from src.env._level_kernel import HAS_NUMBA as HAS_LEVEL_KERNEL, shift_soa
 
 @dataclass
 class Platform:
@@ -40,7 +43,12 @@ class Platform:
             self.last_dy = 0.0
 @dataclass
 class Spike:
-    """Un pic triangulaire attaché à une plateforme."""
+    """Un pic triangulaire attaché à une plateforme.
+
+    world_points/aabb recompute from the parent rect on demand; the per-frame
+    cached copies live in LevelGen's SoA mirrors (spike_tri/spike_aabb),
+    which scroll in place and re-read only spikes on moving platforms — so
+    these methods are off the hot path and need no dirty flag here."""
     platform: Platform        # référence directe à la plateforme
     lane: str                 # "top" ou "bot"
     local_x: int              # offset local depuis left de la plateforme
@@ -73,7 +81,11 @@ class Spike:
 
 
 def _point_in_triangle_strict(p, a, b, c, eps=0.5) -> bool:
-    """Test barycentrique strict: p strictement à l'intérieur du triangle abc (bord exclus)."""
+    """Test barycentrique strict: p strictement à l'intérieur du triangle abc (bord exclus).
+
+    Compiled scalar twins of this and rect_intersects_triangle_strict live in
+    src.env._spike_kernel (njit over raw ints, no fastmath, same verdicts);
+    these interpreted versions are the reference and the no-numba fallback."""
     (px, py) = p
     (ax, ay), (bx, by), (cx, cy) = a, b, c
     v0x, v0y = cx - ax, cy - ay
@@ -148,19 +160,99 @@ class LevelGen:
     """
     Generates an endless ribbon of platforms scrolling left.
     Improved moving platform generation with better safety guarantees.
+
+    Layout is hybrid structure-of-arrays: the Platform/Spike objects stay the
+    source of truth for identity (spikes hold platform references, the player
+    tracks the platform it stands on, draw reads rects), while persistent
+    NumPy mirrors of their geometry and movement parameters carry the
+    per-frame work — scroll and oscillation are single vectorized passes,
+    and collision/observation consumers query the arrays. Replacing the
+    objects outright would break those references and the recorded-trace
+    parity the replay tooling depends on, for no further per-frame win.
     """
     def __init__(self, seed: int | None):
+        # Seeded stdlib Mersenne Twister, consumed one draw at a time: the
+        # exact call sequence defines what each seed's level looks like, so
+        # swapping in a faster generator (or buffering draws in bulk) would
+        # silently re-roll every recorded layout. Generation draws are only
+        # a handful per burst — not worth the contract break.
+        self.rng = random.Random()
+        self.platforms: List[Platform] = []
+        self.spikes: List[Spike] = []
+
+        # SoA mirrors of platforms/spikes (see _refresh_soa). Derived caches:
+        # the object lists stay the source of truth for generation/drawing.
+        self.plat_left = np.empty(0, dtype=np.int32)
+        self.plat_top = np.empty(0, dtype=np.int32)
+        self.plat_right = np.empty(0, dtype=np.int32)
+        self.plat_bottom = np.empty(0, dtype=np.int32)
+        self.plat_is_top = np.empty(0, dtype=bool)
+        self.spike_tri = np.empty((0, 3, 2), dtype=np.int32)
+        self.spike_aabb = np.empty((0, 4), dtype=np.int32)  # (x0, y0, x1, y1)
+        self.spike_is_top = np.empty(0, dtype=bool)
+
+        # Incremental-refresh bookkeeping: while the platform/spike SET is
+        # unchanged, per-frame motion is a uniform x shift plus the movers'
+        # y — the SoA arrays are nudged in place (_scroll_soa) instead of
+        # rebuilt. _geom_dirty forces the full rebuild after set changes.
+        self._plat_coords = np.empty((0, 4), dtype=np.int32)
+        self._mov_plat_idx = np.empty(0, dtype=np.intp)
+        self._spike_on_mover = np.empty(0, dtype=np.intp)
+        self._geom_dirty = True
+
+        # Movement SoA: parameters of the moving platforms as parallel arrays
+        # so the per-frame oscillation is one vectorized pass instead of a
+        # method call + sin() per platform (see _rebuild_movement_soa).
+        self._moving: List[Platform] = []
+        self._mov_time = np.empty(0, dtype=np.float64)
+        self._mov_speed = np.empty(0, dtype=np.float64)
+        self._mov_range = np.empty(0, dtype=np.float64)
+        self._mov_orig_y = np.empty(0, dtype=np.float64)
+        self._movement_dirty = True
+
+        # Pre-filled platform surfaces keyed by (width, color) for the
+        # batched draw (see draw); kept across resets.
+        self._tile_cache: dict = {}
+
+        # Pre-rasterized spike triangles keyed by (lane, base, height),
+        # blitted per spike instead of re-filling a polygon each frame;
+        # kept across resets like the tiles.
+        self._spike_stamps: dict = {}
+
+        # Cached [p.rect for p in platforms]: the Rect objects are mutated in
+        # place by scrolling, so the list only goes stale when platforms are
+        # added or removed (same invalidation points as the movement SoA).
+        self._rects_cache: List[pygame.Rect] = []
+        self._rects_dirty = True
+
+        self.reset(seed)
+
+    def reset(self, seed: int | None):
+        """Re-world this instance in place for a new episode.
+
+        Reseeding the existing rng gives the same stream as a fresh
+        LevelGen(seed), so episode generation is unchanged — but callers
+        running many episodes (env reset loops) reuse one instance instead of
+        rebuilding the object and its SoA arrays every time."""
         if seed is None:
             seed = random.randrange(0, 2**32 - 1)
         self.seed = seed
-        self.rng = random.Random(seed)
-        self.platforms: List[Platform] = []
-        self.spikes: List[Spike] = []
+        self.rng.seed(seed)
+        self.platforms.clear()
+        self.spikes.clear()
         self.consecutive_moving = 0  # Track consecutive moving platforms
         self.last_safe_x = 0  # X position of last guaranteed safe platform pair
+        self._movement_dirty = True
+        self._rects_dirty = True
+        self._geom_dirty = True
+
         self._init_start()
+        self._refresh_soa()
 
     def _init_start(self):
+        # Startup fill is already O(N): force_static short-circuits the
+        # movement decision before any RNG draw or platform scan, so a
+        # dedicated static constructor would only duplicate the rect setup.
         x = 0
         while x < WIDTH * 1.5:
             w = WIDTH // 3
@@ -205,7 +297,11 @@ class LevelGen:
             
             move_range = safe_range
             move_speed = MOVING_PLATFORM_SPEED
-            # Random starting phase to vary movement patterns
+            # Random starting phase to vary movement patterns. The 6.28
+            # approximation of 2*pi is load-bearing: it feeds seeded phases,
+            # so "correcting" it would change every recorded layout. The draw
+            # stays on self.rng — phases are interleaved with the other
+            # generation draws, which rules out batch-initializing them.
             move_time = self.rng.random() * 6.28
             self.consecutive_moving += 1
         else:
@@ -251,6 +347,11 @@ class LevelGen:
         desired = self.rng.randint(SPIKE_MIN_PER_PLATFORM, SPIKE_MAX_PER_PLATFORM)
         count = int(min(desired, max_possible))
 
+        # Rejection sampling, kept as-is: a closed-form jittered-cell
+        # placement would be O(count) but draws differently from the rng
+        # stream and lands spikes elsewhere — every seeded layout would
+        # change. The loop is bounded (≤50 draws) and runs only when a
+        # platform is created, not per frame.
         positions = []
         attempts = 0
         while len(positions) < count and attempts < 50:
@@ -293,7 +394,10 @@ class LevelGen:
         w = self._rand_w(SEGMENT_MIN_W, SEGMENT_MAX_W)
         platforms = []
         
-        # Strategy: ensure at least one platform is static for safety
+        # Strategy: ensure at least one platform is static for safety.
+        # The safe-path rule is this O(1) consecutive_moving counter — it
+        # never scans self.platforms, so generation cost stays independent
+        # of how many platforms are live.
         force_one_static = self.consecutive_moving > 0 or self.rng.random() < 0.7
         
         if force_one_static:
@@ -318,36 +422,88 @@ class LevelGen:
         return [], w
 
     def _rand_w(self, lo: int, hi: int) -> int:
-        return int(self.rng.uniform(lo, hi))
+        # Inline of int(self.rng.uniform(lo, hi)): one random() draw scaled
+        # directly, skipping the uniform() Python call. Same stream position;
+        # lo is a non-negative int so the truncation commutes.
+        return lo + int(self.rng.random() * (hi - lo))
 
     def update_and_generate(self, dt: float):
         """
         Update existing platforms and generate new ones as needed
         """
-        # Scroll all platforms left
+        # Scroll all platforms left. The SoA mirrors take the same shift as
+        # one vectorized subtraction in _scroll_soa below; this loop is the
+        # remaining Rect sync, and it can't be deferred to draw time because
+        # every live platform is within the visible band (world extends to
+        # 1.5x WIDTH, culled at -200) and spike/generation code reads the
+        # rects directly.
         dx = int(SCROLL_PX_PER_S * dt)
         for platform in self.platforms:
             platform.rect.x -= dx
-            platform.update_movement(dt)
 
-        # Remove off-screen platforms
-        self.platforms = [p for p in self.platforms if p.rect.right > -200]
-
-        # Clean spikes attached to removed platforms (use identity, not hashing)
-        valid_ids = {id(p) for p in self.platforms}
-        self.spikes = [
-            s for s in self.spikes
-            if (id(s.platform) in valid_ids and s.platform.rect.right > -200)
-]
-
-        # Generate new platforms as needed
-        right_edge = max((p.rect.right for p in self.platforms), default=0)
+        # Oscillate the moving platforms in one vectorized pass over the
+        # movement SoA (same arithmetic as Platform.update_movement; statics
+        # skip the per-frame method call entirely — their last_dy stays 0).
+        #
+        # The arrays are float64 on purpose: Platform.update_movement did the
+        # arithmetic in doubles, and float32 phases would drift the rounded
+        # pixel y away from the recorded layouts.
+        #
+        # Deliberately exact np.sin, not a lookup table: platform y feeds
+        # collisions and deaths, so even sub-pixel phase error from a LUT
+        # would make recorded episodes (experiments/replay.py) diverge on
+        # re-simulation. With the pass vectorized there are only a few
+        # movers' worth of sin per frame left to save anyway.
+        if self._movement_dirty:
+            self._rebuild_movement_soa()
+        if self._moving:
+            self._mov_time += dt * self._mov_speed
+            new_y = self._mov_orig_y + self._mov_range * np.sin(self._mov_time)
+            for i, p in enumerate(self._moving):
+                old_y = p.rect.y
+                p.rect.y = int(new_y[i])
+                p.move_time = float(self._mov_time[i])  # keep the field a plain float
+                p.last_y = old_y
+                p.last_dy = p.rect.y - old_y
+
+        # Remove off-screen platforms. Rights are non-decreasing, so the dead
+        # ones form a prefix: drop it in place instead of re-filtering and
+        # re-allocating the whole list every frame (usually nothing falls off).
+        cut = 0
+        n = len(self.platforms)
+        while cut < n and self.platforms[cut].rect.right <= -200:
+            cut += 1
+        if cut:
+            del self.platforms[:cut]
+            self._movement_dirty = True
+            self._rects_dirty = True
+            self._geom_dirty = True
+
+        # Spikes were appended in platform-creation order, so spikes of culled
+        # platforms form a prefix too — platforms only ever die by scrolling
+        # past the same -200 threshold. No liveness flags or id-set lookups
+        # needed: position in the list is the validity test.
+        cut = 0
+        n = len(self.spikes)
+        while cut < n and self.spikes[cut].platform.rect.right <= -200:
+            cut += 1
+        if cut:
+            del self.spikes[:cut]
+            self._geom_dirty = True
+
+        # Generate new platforms as needed. plat_right is non-decreasing
+        # (appended left-to-right, culled from the front), so the rightmost
+        # edge is just the last platform — no O(N) max() scan per frame.
+        right_edge = self.platforms[-1].rect.right if self.platforms else 0
         target_x = max(right_edge, 0)
         while target_x < WIDTH * 1.5:
             # Decide between segment or gap
             if self.rng.random() < 0.65:  # 65% chance for platform segment
                 new_platforms, width = self._generate_segment_pair(target_x)
                 self.platforms.extend(new_platforms)
+                self._movement_dirty = True
+                self._rects_dirty = True
+                self._geom_dirty = True
                 for i in range(len(self.platforms) - len(new_platforms), len(self.platforms)):
                     self._on_platform_created(self.platforms[i], safe=False)
             else:  # 35% chance for gap
@@ -357,18 +513,229 @@ class LevelGen:
             
             target_x += width
 
-    def draw(self, surf: pygame.Surface, color: Tuple[int, int, int]):
-        """Draw all platforms"""
-        for platform in self.platforms:
-            # Optional: Draw moving platforms in a different shade
-            if platform.platform_type == "moving":
-                # Slightly brighter color for moving platforms
-                r, g, b = color
-                moving_color = (min(255, r + 20), min(255, g + 20), min(255, b + 20))
-                pygame.draw.rect(surf, moving_color, platform.rect)
-            else:
-                pygame.draw.rect(surf, color, platform.rect)
-                
-        for sp in self.spikes:
+        # World geometry for this frame is final; bring the SoA mirrors up to
+        # date so every consumer (obs probes, collision filters) reads arrays
+        # instead of re-materializing [p.rect for p in platforms]. Most frames
+        # change no platform/spike set, so the cheap in-place nudge applies.
+        if self._geom_dirty:
+            self._refresh_soa()
+        else:
+            self._scroll_soa(dx)
+
+    def _rebuild_movement_soa(self):
+        """Re-gather the moving platforms' oscillation parameters into
+        parallel float arrays. Rebuilt only when the platform set changes;
+        between rebuilds the arrays are the source of truth for move_time
+        (written back to the objects each frame so a rebuild never reads a
+        stale phase)."""
+        self._moving = [p for p in self.platforms if p.platform_type == "moving"]
+        self._mov_time = np.array([p.move_time for p in self._moving], dtype=np.float64)
+        self._mov_speed = np.array([p.move_speed for p in self._moving], dtype=np.float64)
+        self._mov_range = np.array([p.move_range for p in self._moving], dtype=np.float64)
+        self._mov_orig_y = np.array([p.original_y for p in self._moving], dtype=np.float64)
+        self._movement_dirty = False
+
+    def _refresh_soa(self):
+        """Rebuild the NumPy structure-of-arrays views of platforms and spikes.
+
+        One pass over each object list per frame; afterwards plat_left/right/
+        top/bottom + plat_is_top and spike_tri/spike_aabb + spike_is_top are
+        contiguous arrays broadcasting-ready for vectorized queries.
+        """
+        n = len(self.platforms)
+        coords = np.empty((n, 4), dtype=np.int32)
+        is_top = np.empty(n, dtype=bool)
+        for i, p in enumerate(self.platforms):
+            r = p.rect
+            coords[i, 0] = r.left
+            coords[i, 1] = r.top
+            coords[i, 2] = r.right
+            coords[i, 3] = r.bottom
+            is_top[i] = p.lane == "top"
+        self._plat_coords = coords
+        self.plat_left = coords[:, 0]
+        self.plat_top = coords[:, 1]
+        self.plat_right = coords[:, 2]
+        self.plat_bottom = coords[:, 3]
+        self.plat_is_top = is_top
+        self._mov_plat_idx = np.array(
+            [i for i, p in enumerate(self.platforms) if p.platform_type == "moving"],
+            dtype=np.intp)
+
+        s = len(self.spikes)
+        tri = np.empty((s, 3, 2), dtype=np.int32)
+        aabb = np.empty((s, 4), dtype=np.int32)
+        spike_top = np.empty(s, dtype=bool)
+        for i, sp in enumerate(self.spikes):
             A, B, C = sp.world_points()
-            pygame.draw.polygon(surf, COLOR_SPIKE, (A, B, C))
\ No newline at end of file
+            tri[i, 0] = A
+            tri[i, 1] = B
+            tri[i, 2] = C
+            xs = (A[0], B[0], C[0])
+            ys = (A[1], B[1], C[1])
+            aabb[i, 0] = min(xs)
+            aabb[i, 1] = min(ys)
+            aabb[i, 2] = max(xs)
+            aabb[i, 3] = max(ys)
+            spike_top[i] = sp.lane == "top"
+        self.spike_tri = tri
+        self.spike_aabb = aabb
+        self.spike_is_top = spike_top
+        self._spike_on_mover = np.array(
+            [i for i, sp in enumerate(self.spikes)
+             if sp.platform.platform_type == "moving"],
+            dtype=np.intp)
+        self._geom_dirty = False
+
+    def _scroll_soa(self, dx: int):
+        """In-place SoA update for a frame with no platform/spike set change.
+
+        Everything translates left by dx; only the moving platforms (and the
+        spikes riding them) change y, so those few rows are rewritten from
+        the freshly updated rects. Produces exactly what _refresh_soa would.
+        """
+        c = self._plat_coords
+        if HAS_LEVEL_KERNEL:
+            # One fused compiled pass over the x columns (integer-only, so
+            # bit-identical to the slice ops below).
+            shift_soa(c, self.spike_tri, self.spike_aabb, dx)
+        else:
+            c[:, 0] -= dx
+            c[:, 2] -= dx
+            if self.spike_tri.shape[0]:
+                self.spike_tri[:, :, 0] -= dx
+                self.spike_aabb[:, 0] -= dx
+                self.spike_aabb[:, 2] -= dx
+        for i in self._mov_plat_idx:
+            r = self.platforms[i].rect
+            c[i, 1] = r.top
+            c[i, 3] = r.bottom
+
+        if self.spike_tri.shape[0]:
+            for i in self._spike_on_mover:
+                A, B, C = self.spikes[i].world_points()
+                self.spike_tri[i, 0] = A
+                self.spike_tri[i, 1] = B
+                self.spike_tri[i, 2] = C
+                ys = (A[1], B[1], C[1])
+                self.spike_aabb[i, 1] = min(ys)
+                self.spike_aabb[i, 3] = max(ys)
+
+    @property
+    def rects(self) -> List[pygame.Rect]:
+        """The platforms' rects as a cached list (same order as
+        self.platforms). Rebuilt only when the platform set changes —
+        scrolling mutates the Rects in place, so between changes the cached
+        list stays valid. Callers must not hold it across frames."""
+        if self._rects_dirty:
+            self._rects_cache = [p.rect for p in self.platforms]
+            self._rects_dirty = False
+        return self._rects_cache
+
+    def any_spike_hit(self, pr: pygame.Rect) -> bool:
+        """Strict spike death test against the player rect.
+
+        With numba present this is one compiled pass over the SoA spike
+        arrays (AABB prefilter inline, early exit on first hit); otherwise a
+        vectorized candidate scan feeds the interpreted triangle test. Both
+        give the verdict of rect_intersects_triangle_strict per spike.
+
+        There is deliberately no broadcast (rects x spikes) matrix variant:
+        each frame tests exactly one player rect, the AABB prefilter leaves
+        ~0-2 candidates, and any-hit semantics reward the early exit that a
+        full barycentric/edge matrix would have to forgo.
+        """
+        aabb = self.spike_aabb
+        if aabb.shape[0] == 0:
+            return False
+        if HAS_SPIKE_KERNEL:
+            return bool(any_spike_hits(pr.left, pr.top, pr.right, pr.bottom,
+                                       self.spike_tri, aabb))
+        cand = np.flatnonzero(
+            (aabb[:, 0] < pr.right) & (aabb[:, 2] > pr.left) &
+            (aabb[:, 1] < pr.bottom) & (aabb[:, 3] > pr.top)
+        )
+        for i in cand:
+            if rect_intersects_triangle_strict(pr, self.spikes[i].world_points()):
+                return True
+        return False
+
+    def query_near_x(self, x: int, margin: int) -> List[Platform]:
+        """Platforms whose x-extent intersects [x-margin, x+margin].
+
+        Broad phase for collision/probe consumers. Generation appends
+        platforms left-to-right and culling pops the front, so plat_left and
+        plat_right are both non-decreasing (movement is y-only): the
+        intersecting platforms are one contiguous run, found with two binary
+        searches — no bucket grid to maintain. Returns a list slice in the
+        same order as self.platforms, so first-hit semantics are unchanged.
+        """
+        lo = int(np.searchsorted(self.plat_right, x - margin, side="left"))
+        hi = int(np.searchsorted(self.plat_left, x + margin, side="right"))
+        return self.platforms[lo:hi]
+
+    def _platform_tile(self, w: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Pre-filled (w, PLATFORM_THICKNESS) surface for the batched draw.
+
+        Cached per (width, color): platform heights are constant, so a filled
+        tile replaces a pygame.draw.rect fill call per platform per frame.
+        """
+        key = (w, color)
+        tile = self._tile_cache.get(key)
+        if tile is None:
+            tile = pygame.Surface((w, PLATFORM_THICKNESS))
+            tile.fill(color)
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert()  # display format -> fast blit path
+            self._tile_cache[key] = tile
+        return tile
+
+    def _spike_stamp(self, lane: str, base: int, height: int) -> pygame.Surface:
+        """Per-pixel-alpha surface with the spike triangle baked in.
+
+        pygame.draw.polygon fills boundary pixels inclusively, so the stamp
+        is one pixel wider/taller than the triangle's extent; the polygon is
+        unantialiased, making the blit pixel-identical to drawing it live.
+        """
+        key = (lane, base, height)
+        stamp = self._spike_stamps.get(key)
+        if stamp is None:
+            half = base // 2
+            stamp = pygame.Surface((2 * half + 1, height + 1), pygame.SRCALPHA)
+            if lane == "bot":
+                pts = [(0, height), (2 * half, height), (half, 0)]   # pointe en haut
+            else:
+                pts = [(0, 0), (2 * half, 0), (half, height)]        # pointe en bas
+            pygame.draw.polygon(stamp, COLOR_SPIKE, pts)
+            if pygame.display.get_surface() is not None:
+                stamp = stamp.convert_alpha()
+            self._spike_stamps[key] = stamp
+        return stamp
+
+    def draw(self, surf: pygame.Surface, color: Tuple[int, int, int]):
+        """Draw all platforms in one blits batch, then the spikes."""
+        # Slightly brighter color for moving platforms. Static and moving
+        # share the same blits call — the tile cache keys on (width, color),
+        # so splitting into two batches would buy nothing. Full-size tiles,
+        # not 1px stamps with an area rect: blit areas crop, they don't
+        # stretch.
+        r, g, b = color
+        moving_color = (min(255, r + 20), min(255, g + 20), min(255, b + 20))
+        surf.blits([
+            (self._platform_tile(p.rect.w,
+                                 moving_color if p.platform_type == "moving" else color),
+             p.rect.topleft)
+            for p in self.platforms
+        ], doreturn=False)
+
+        # Spikes: one blits batch of prebaked triangle stamps — no polygon
+        # rasterization per spike per frame. Stamp topleft is the triangle's
+        # AABB corner (base centre cx minus half, tip side offset by height).
+        if self.spikes:
+            surf.blits([
+                (self._spike_stamp(sp.lane, sp.base, sp.height),
+                 (sp.platform.rect.left + sp.local_x - sp.base // 2,
+                  sp.platform.rect.top - sp.height if sp.lane == "bot"
+                  else sp.platform.rect.bottom))
+                for sp in self.spikes
+            ], doreturn=False)
\ No newline at end of file
@@ -1,11 +1,13 @@
 # src/game/player.py
 from __future__ import annotations
+import numpy as np
 import pygame
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 from .config import (
     PLAYER_X, PLAYER_W, PLAYER_H, G_ABS, MAX_VY, JUMP_COOLDOWN_S
 )
+from src.env._substep import integrate_substep, sweep_platforms
 
 @dataclass
 class Player:
@@ -25,9 +27,20 @@ class Player:
     _standing_on_platform: Optional[object] = None
     _platform_contact_buffer: float = 0.0  # Small buffer time to maintain contact
 
+    # Reused backing Rect for the `rect` property (lazily created so the
+    # dataclass default stays trivial). Each access refreshes x/y in place
+    # instead of constructing a new pygame.Rect; callers must not hold the
+    # returned Rect across position changes.
+    _rect: Optional[pygame.Rect] = None
+
     @property
     def rect(self) -> pygame.Rect:
-        return pygame.Rect(int(self.x), int(self.y), PLAYER_W, PLAYER_H)
+        r = self._rect
+        if r is None:
+            r = self._rect = pygame.Rect(0, 0, PLAYER_W, PLAYER_H)
+        r.x = int(self.x)
+        r.y = int(self.y)
+        return r
 
     def can_flip(self) -> bool:
         return (self._flip_cooldown <= 0.0) and (self.grounded or self._platform_contact_buffer > 0.0)
@@ -46,24 +59,115 @@ class Player:
         return False
 
     def update_physics(self, dt: float):
-        """Integrate vertical motion under signed gravity, clamp velocity."""
-        if self._flip_cooldown > 0:
-            self._flip_cooldown -= dt
-            if self._flip_cooldown < 0.0:
-                self._flip_cooldown = 0.0
+        """Integrate vertical motion under signed gravity, clamp velocity.
+
+        The arithmetic lives in the compiled `integrate_substep` (numba when
+        available, same code as plain Python otherwise)."""
+        self.y, self.vy, self._flip_cooldown, self._platform_contact_buffer = \
+            integrate_substep(self.y, self.vy, float(self.grav_dir),
+                              self._flip_cooldown, self._platform_contact_buffer,
+                              dt, G_ABS, MAX_VY)
 
-        # Apply gravity
-        self.vy += self.grav_dir * G_ABS * dt
+    def update_and_collide(self, dt: float, platforms: List[object]) -> Tuple[bool, bool]:
+        """Fused sub-step: integrate vertical motion, then resolve platform
+        collisions — one dispatch per sim frame for the hot env loop, with
+        semantics identical to calling the two phases separately."""
+        self.update_physics(dt)
+        return self.resolve_collisions_with_platforms(platforms)
 
-        # Clamp vertical speed
-        self.vy = max(-MAX_VY, min(MAX_VY, self.vy))
+    def update_and_collide_soa(self, dt: float, level) -> Tuple[bool, bool]:
+        """SoA twin of update_and_collide: the collision sweep runs on
+        LevelGen's sorted bound arrays (see resolve_collisions_soa)."""
+        self.update_physics(dt)
+        return self.resolve_collisions_soa(level)
+
+    def resolve_collisions_soa(self, level) -> Tuple[bool, bool]:
+        """Fast-path twin of resolve_collisions_with_platforms reading
+        LevelGen's SoA columns: the candidate window comes from two binary
+        searches on the sorted bounds and the crossing search runs compiled
+        (src.env._substep.sweep_platforms). Same predicates, same order, so
+        the first hit — and everything downstream of it — is identical; the
+        hit Platform is recovered by index for moving-platform bookkeeping.
+        """
+        HORIZONTAL_TOLERANCE = 2   # px, évite l'accrochage latéral
+        VERTICAL_STICK_TOL   = 3   # px, tolérance de collage
+        CONTACT_BUFFER_S     = 0.08
 
-        # Integrate position
-        self.y += self.vy * dt
+        body_top = int(self.y)
+        body_bottom = body_top + PLAYER_H
+        # check rect = player rect deflated by HORIZONTAL_TOLERANCE each side
+        check_left = PLAYER_X - PLAYER_W // 2 + HORIZONTAL_TOLERANCE
+        check_right = check_left + PLAYER_W - 2 * HORIZONTAL_TOLERANCE
+
+        new_grounded = False
+        collision_occurred = False
+        contacted_platform = None
+
+        # 0) Si on était déjà posé sur une plateforme mobile, tenter de maintenir le contact
+        if self._standing_on_platform is not None and self._platform_contact_buffer > 0.0:
+            plat = self._standing_on_platform
+            plat_rect = plat.rect
 
-        # Update platform contact buffer
-        if self._platform_contact_buffer > 0.0:
-            self._platform_contact_buffer = max(0.0, self._platform_contact_buffer - dt)
+            if not (check_right <= plat_rect.left or check_left >= plat_rect.right):
+                if self.grav_dir > 0:
+                    if abs(body_bottom - plat_rect.top) <= VERTICAL_STICK_TOL:
+                        self.y += getattr(plat, "last_dy", 0)
+                        new_grounded = True
+                        collision_occurred = True
+                else:
+                    if abs(body_top - plat_rect.bottom) <= VERTICAL_STICK_TOL:
+                        self.y += getattr(plat, "last_dy", 0)
+                        new_grounded = True
+                        collision_occurred = True
+
+            if new_grounded and getattr(plat, "platform_type", "static") == "moving":
+                self._platform_contact_buffer = max(self._platform_contact_buffer, CONTACT_BUFFER_S / 2.0)
+
+        # 1) Balayage collisions "fraîches" — fenêtre triée + kernel
+        if not new_grounded:
+            p_left = level.plat_left
+            p_right = level.plat_right
+            lo = int(np.searchsorted(p_right, check_left, side="right"))
+            hi = int(np.searchsorted(p_left, check_right, side="left"))
+            if lo < hi:
+                idx = sweep_platforms(check_left, check_right,
+                                      body_top, body_bottom,
+                                      self.vy, self.grav_dir > 0,
+                                      p_left[lo:hi], level.plat_top[lo:hi],
+                                      p_right[lo:hi], level.plat_bottom[lo:hi])
+                if idx >= 0:
+                    plat = level.platforms[lo + idx]
+                    plat_rect = plat.rect
+                    if self.grav_dir > 0:
+                        # Snap: top = plat.top - hauteur
+                        self.y = plat_rect.top - PLAYER_H
+                    else:
+                        # Snap: top = plat.bottom (car top-based)
+                        self.y = plat_rect.bottom
+                    self.vy = 0.0
+                    new_grounded = True
+                    collision_occurred = True
+                    contacted_platform = plat
+
+                    if getattr(plat, "platform_type", "static") == "moving":
+                        self.y += getattr(plat, "last_dy", 0)
+                        self._standing_on_platform = plat
+                        self._platform_contact_buffer = CONTACT_BUFFER_S
+
+        # 2) Gestion des états/flags
+        if new_grounded:
+            if contacted_platform is not None:
+                self._standing_on_platform = contacted_platform
+                if getattr(contacted_platform, "platform_type", "static") == "moving":
+                    self._platform_contact_buffer = CONTACT_BUFFER_S
+                else:
+                    self._platform_contact_buffer = 0.0
+        else:
+            if self._platform_contact_buffer <= 0.0:
+                self._standing_on_platform = None
+
+        self.grounded = new_grounded
+        return new_grounded, collision_occurred
 
     def resolve_collisions_with_platforms(self, platforms: List[object]) -> Tuple[bool, bool]:
         """
@@ -75,15 +179,13 @@ class Player:
         VERTICAL_STICK_TOL   = 3   # px, tolérance de collage
         CONTACT_BUFFER_S     = 0.08
 
-        # Rect du joueur (TOP-based)
-        player_rect = pygame.Rect(
-            PLAYER_X - PLAYER_W // 2,
-            int(self.y),
-            PLAYER_W,
-            PLAYER_H
-        )
-        check_rect = player_rect.copy()
-        check_rect.inflate_ip(-HORIZONTAL_TOLERANCE * 2, 0)
+        # Bornes du joueur (TOP-based) en ints nus — mêmes valeurs que
+        # l'ancien player_rect/check_rect sans construire deux Rects par
+        # appel (voir resolve_collisions_soa, même forme).
+        body_top = int(self.y)
+        body_bottom = body_top + PLAYER_H
+        check_left = PLAYER_X - PLAYER_W // 2 + HORIZONTAL_TOLERANCE
+        check_right = check_left + PLAYER_W - 2 * HORIZONTAL_TOLERANCE
 
         new_grounded = False
         collision_occurred = False
@@ -95,20 +197,18 @@ class Player:
             plat_rect = plat.rect
 
             # overlap horizontal ?
-            if not (check_rect.right <= plat_rect.left or check_rect.left >= plat_rect.right):
+            if not (check_right <= plat_rect.left or check_left >= plat_rect.right):
                 if self.grav_dir > 0:
-                    # posé SUR (on veut player_rect.bottom ~ plat.top)
-                    if abs(player_rect.bottom - plat_rect.top) <= VERTICAL_STICK_TOL:
+                    # posé SUR (on veut body_bottom ~ plat.top)
+                    if abs(body_bottom - plat_rect.top) <= VERTICAL_STICK_TOL:
                         # transporter avec la plateforme
                         self.y += getattr(plat, "last_dy", 0)
-                        player_rect.top = int(self.y)
                         new_grounded = True
                         collision_occurred = True
                 else:
-                    # collé DESSOUS (on veut player_rect.top ~ plat.bottom)
-                    if abs(player_rect.top - plat_rect.bottom) <= VERTICAL_STICK_TOL:
+                    # collé DESSOUS (on veut body_top ~ plat.bottom)
+                    if abs(body_top - plat_rect.bottom) <= VERTICAL_STICK_TOL:
                         self.y += getattr(plat, "last_dy", 0)
-                        player_rect.top = int(self.y)
                         new_grounded = True
                         collision_occurred = True
 
@@ -118,23 +218,27 @@ class Player:
 
         # 1) Balayage collisions "fraîches"
         if not new_grounded:
+            grav_down = self.grav_dir > 0
             for plat in platforms:
                 plat_rect = plat.rect
+                # one unpack per platform instead of one read per comparison
+                p_l, p_t, p_r, p_b = (plat_rect.left, plat_rect.top,
+                                      plat_rect.right, plat_rect.bottom)
 
                 # filtre horizontal
-                if (check_rect.right <= plat_rect.left) or (check_rect.left >= plat_rect.right):
+                if (check_right <= p_l) or (check_left >= p_r):
                     continue
 
-                if self.grav_dir > 0:
+                if grav_down:
                     # Atterrir SUR la plateforme (du dessus)
                     is_crossing_top = (
-                        player_rect.bottom >= plat_rect.top and
-                        player_rect.top    <  plat_rect.top and
+                        body_bottom >= p_t and
+                        body_top    <  p_t and
                         self.vy >= 0.0
                     )
                     if is_crossing_top:
                         # Snap: top = plat.top - hauteur
-                        self.y  = plat_rect.top - PLAYER_H
+                        self.y  = p_t - PLAYER_H
                         self.vy = 0.0
                         new_grounded = True
                         collision_occurred = True
@@ -149,13 +253,13 @@ class Player:
                 else:
                     # Coller SOUS la plateforme (plafond)
                     is_crossing_bottom = (
-                        player_rect.top    <= plat_rect.bottom and
-                        player_rect.bottom >  plat_rect.bottom and
+                        body_top    <= p_b and
+                        body_bottom >  p_b and
                         self.vy <= 0.0
                     )
                     if is_crossing_bottom:
                         # Snap: top = plat.bottom (car top-based)
-                        self.y  = plat_rect.bottom
+                        self.y  = p_b
                         self.vy = 0.0
                         new_grounded = True
                         collision_occurred = True
@@ -49,11 +49,15 @@ def smoke_test(steps: int, seed: int, frame_skip: int) -> None:
     try:
         obs, info = env.reset(seed=seed)
         assert env.observation_space.contains(obs), "Initial observation not in space"
+        assert isinstance(obs, np.ndarray) and obs.dtype == np.float32, \
+            "Observation must be a float32 ndarray (no list/float boxing)"
 
         for t in range(steps):
             a = env.action_space.sample()
             obs, r, term, trunc, info = env.step(a)
             assert isinstance(r, float), "Reward must be a float"
+            assert isinstance(obs, np.ndarray) and obs.dtype == np.float32, \
+                f"Step {t}: observation must stay a float32 ndarray"
             assert env.observation_space.contains(obs), f"Step {t}: observation out of bounds"
             if term or trunc:
                 break
@@ -0,0 +1,39 @@
+# tools/build_obs_aot.py
+"""
+Ahead-of-time compile the observation probe kernel.
+
+`python -m tools.build_obs_aot` (from the repo root) produces
+src/env/_gg_obs_aot.*.so via numba's pycc. When that module is present,
+src.env._obs_kernel imports the prebuilt kernel instead of JIT-compiling, so
+a cold process (fresh numba cache, e.g. a new training box or CI run) pays
+zero compile latency on its first step. Without the .so nothing changes:
+the @njit(cache=True) path still compiles once and caches on disk.
+
+The .so is a build artifact (gitignored) — rebuild it after editing
+probe_kernel, or delete it to fall back to the JIT.
+"""
+from __future__ import annotations
+from pathlib import Path
+
+from numba.pycc import CC
+
+from src.env._obs_kernel import _probe_kernel_jit
+
+# Same dtypes the builder passes at runtime: SoA int32 columns (strided
+# views), bool lane flags, int64 searchsorted bounds, float32 out buffer.
+_SIG = ("void(f8, f8, f8, f8, f8,"
+        " i4[:], i4[:], i4[:], i4[:], b1[:],"
+        " i4[:], b1[:],"
+        " i4[:], i8[:], i8, i8, f4[:])")
+
+
+def main():
+    cc = CC("_gg_obs_aot")
+    cc.output_dir = str(Path(__file__).resolve().parent.parent / "src" / "env")
+    cc.export("probe_kernel", _SIG)(_probe_kernel_jit.py_func)
+    cc.compile()
+    print(f"Built {cc.output_dir}/{cc.name}*.so")
+
+
+if __name__ == "__main__":
+    main()